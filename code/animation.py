@@ -0,0 +1,79 @@
+from assets import assets
+from settings import TILE_ANIMATION_SPEED
+
+
+class AnimationClock:
+    """
+    A class to run the animations shared by many sprites, like the animations of coins and flowers. All sprites of an
+    animation type show the same frame, so the clock advances one phase per animation type and simulation tick, and
+    the sprites look their frame up only when they are drawn. The cost per tick depends on the number of animation
+    types, not on the number of animated sprites.
+
+    Attributes
+    ----------
+    frames : dict
+        name of every animation type mapped to its list of images
+    speeds : dict
+        name of every animation type mapped to the increment of its phase per simulation tick
+    phases : dict
+        name of every animation type mapped to the index of its current frame as float
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self.speeds = {}
+        self.phases = {}
+
+    def register(self, name, path, speed=TILE_ANIMATION_SPEED):
+        """
+        Adds an animation type, does nothing if the type is already known.
+
+        Parameters
+        ----------
+        name : str
+            name of the animation type
+        path : str
+            folder of the animation images
+        speed : float
+            increment of the phase per simulation tick
+        """
+        if name not in self.frames:
+            self.frames[name] = assets.folder(path)
+            self.speeds[name] = speed
+            self.phases[name] = 0
+
+    def reset(self):
+        """
+        Restarts every animation at its first frame, called when a level is created.
+        """
+        for name in self.phases:
+            self.phases[name] = 0
+
+    def advance(self):
+        """
+        Advances the phase of every animation type by one simulation tick, loops over the frames of the animation.
+        """
+        for name, phase in self.phases.items():
+            phase += self.speeds[name]
+            if int(phase) >= len(self.frames[name]):
+                phase = 0
+            self.phases[name] = phase
+
+    def frame(self, name):
+        """
+        Returns the current frame of an animation type.
+
+        Parameters
+        ----------
+        name : str
+            name of the animation type
+
+        Returns
+        ----------
+        pygame.Surface : current image of the animation
+        """
+        return self.frames[name][int(self.phases[name])]
+
+
+# process-wide animation clock, advanced by the running level
+animation_clock = AnimationClock()
@@ -0,0 +1,348 @@
+from collections import OrderedDict
+from os.path import dirname, normpath
+
+import pygame
+
+from atlas import load_atlas
+from settings import ASSET_CACHE_BUDGET
+from support import import_folder, import_cut_graphics
+
+
+class AssetRegistry:
+    """
+    A class to load every image asset of the game exactly once. Images, image-folders and cut tile sheets are decoded
+    and converted on first request and the same surfaces are shared by all sprites, levels and menus afterwards.
+    Entries are evicted in least-recently-used order as soon as the cached surfaces exceed the memory budget, so
+    switching between levels does not grow memory without bound. Images decoded in advance by a background thread
+    (see preload.py) can be provided, they are only converted on first request instead of loaded from disk. If the
+    texture atlas is built (see atlas.py), images, image-folders and tile sheets packed into it are returned as
+    subsurfaces of the atlas pages: a few files are loaded instead of every frame and all frames share the pixels of
+    their page. Atlas pages are pinned: they count to the budget but are never evicted, since the cached frames keep
+    their page alive anyway and loading it again would hold its pixels twice.
+
+    Parameters
+    ----------
+    budget : int
+        maximum amount of bytes of pixel data held by the registry
+
+    Attributes
+    ----------
+    budget : int
+        see Parameters
+    entries : OrderedDict
+        cache key mapped to (asset, size in bytes), ordered from least to most recently used
+    size : int
+        bytes of pixel data currently held
+    hits : int
+        requests answered from the cache
+    misses : int
+        requests which had to load from disk
+    evictions : int
+        entries dropped to stay within the budget
+    decoded : dict
+        normalized path mapped to an image surface decoded in advance, not yet converted
+    atlas : dict
+        index of the texture atlas, empty if there is no up to date atlas, None until the first request
+    pages : dict
+        normalized path of every loaded atlas page mapped to its converted surface, pinned outside of entries
+    """
+
+    def __init__(self, budget=ASSET_CACHE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decoded = {}
+        self.atlas = None
+        self.pages = {}
+
+    @staticmethod
+    def surface_size(surface):
+        """
+        Returns the amount of bytes of pixel data of a surface.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            surface to measure
+
+        Returns
+        ----------
+        int : size of the pixel data in bytes
+        """
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def fetch(self, key, loader):
+        """
+        Returns the cached asset for key or calls loader to create it. Marks the entry as most recently used and
+        evicts old entries if the budget is exceeded.
+
+        Parameters
+        ----------
+        key : tuple
+            unique cache key of the asset
+        loader : def
+            function without parameters returning (asset, size in bytes)
+
+        Returns
+        ----------
+        object : cached asset
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        self.misses += 1
+        asset, size = loader()
+        self.entries[key] = (asset, size)
+        self.size += size
+        self.evict()
+        return asset
+
+    def evict(self):
+        """
+        Drops least recently used entries until the registry fits into the budget again. The most recently used entry
+        is always kept, even if it exceeds the budget on its own.
+        """
+        while self.size > self.budget and len(self.entries) > 1:
+            _, (__, size) = self.entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def decode(self, path):
+        """
+        Returns the unconverted surface of an image file, taken from the images decoded in advance if provided.
+
+        Parameters
+        ----------
+        path : str
+            path of the image
+
+        Returns
+        ----------
+        pygame.Surface : decoded image
+        """
+        surface = self.decoded.pop(normpath(path), None)
+        if surface is None:
+            surface = pygame.image.load(path)
+        return surface
+
+    def provide_decoded(self, surfaces):
+        """
+        Provides images decoded in advance for the next requests, see decode().
+
+        Parameters
+        ----------
+        surfaces : dict
+            normalized path mapped to decoded surface
+        """
+        self.decoded.update(surfaces)
+
+    def drop_decoded(self):
+        """
+        Drops the provided images which were not requested.
+        """
+        self.decoded.clear()
+
+    def atlas_index(self):
+        """
+        Returns the index of the texture atlas, loads it on first call.
+
+        Returns
+        ----------
+        dict : atlas index, see build_atlas(), empty if there is no up to date atlas
+        """
+        if self.atlas is None:
+            self.atlas = load_atlas() or {}
+        return self.atlas
+
+    def atlas_frame(self, entry):
+        """
+        Returns a frame of the texture atlas as subsurface of its page, which shares the pixels of the page.
+
+        Parameters
+        ----------
+        entry : list
+            (page, x, y, width, height) of the frame
+
+        Returns
+        ----------
+        pygame.Surface : frame surface
+        """
+        page, x, y, width, height = entry
+        return self.atlas_page(self.atlas['pages'][page]).subsurface((x, y, width, height))
+
+    def atlas_page(self, path):
+        """
+        Returns the converted surface of an atlas page, loads and pins it on first request. Its pixels count to the
+        budget, but it is never evicted.
+
+        Parameters
+        ----------
+        path : str
+            path of the atlas page
+
+        Returns
+        ----------
+        pygame.Surface : page surface
+        """
+        surface = self.pages.get(path)
+        if surface is None:
+            surface = self.decode(path).convert_alpha()
+            self.pages[path] = surface
+            self.size += self.surface_size(surface)
+            self.misses += 1
+            self.evict()
+        return surface
+
+    def source_file(self, path):
+        """
+        Returns the file an image is loaded from: the atlas page it is packed into, otherwise the image file itself.
+
+        Parameters
+        ----------
+        path : str
+            path of the image
+
+        Returns
+        ----------
+        str : path of the file to load
+        """
+        atlas = self.atlas_index()
+        key = normpath(path)
+        if key in atlas.get('images', {}):
+            return atlas['pages'][atlas['images'][key][0]]
+        if atlas.get('sheets', {}).get(key):
+            return atlas['pages'][atlas['sheets'][key][0][0]]
+        return path
+
+    def contains_file(self, path):
+        """
+        Checks whether an image file is cached, on its own, as part of an image-folder or as tile sheet. Only reads the
+        entries, so it may be called from a background thread.
+
+        Parameters
+        ----------
+        path : str
+            path of the image
+
+        Returns
+        ----------
+        bool : True if the image does not have to be loaded again
+        """
+        path = normpath(path)
+        keys = (('image', path, True), ('image', path, False), ('cut', path), ('folder', dirname(path)))
+        return path in self.pages or any(key in self.entries for key in keys)
+
+    def image(self, path, alpha=True):
+        """
+        Returns the converted surface of an image file.
+
+        Parameters
+        ----------
+        path : str
+            path of the image
+        alpha : bool
+            if True the image keeps its per-pixel alpha (convert_alpha()), otherwise it is converted opaque
+
+        Returns
+        ----------
+        pygame.Surface : shared image surface
+        """
+        def load():
+            surface = self.decode(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            return surface, self.surface_size(surface)
+
+        entry = self.atlas_index().get('images', {}).get(normpath(path)) if alpha else None
+        if entry:
+            return self.fetch(('image', normpath(path), alpha), lambda: (self.atlas_frame(entry), 0))
+        return self.fetch(('image', normpath(path), alpha), load)
+
+    def folder(self, path):
+        """
+        Returns all images of a directory as surface list, see import_folder() in support.py.
+
+        Parameters
+        ----------
+        path : str
+            path of the directory
+
+        Returns
+        ----------
+        list : shared surface list of images, must not be modified
+        """
+        def load():
+            files = self.atlas_index().get('folders', {}).get(normpath(path))
+            if files:
+                return [self.atlas_frame(self.atlas['images'][file]) for file in files], 0
+            surfaces = import_folder(path, self.decode)
+            return surfaces, sum(self.surface_size(surface) for surface in surfaces)
+
+        return self.fetch(('folder', normpath(path)), load)
+
+    def cut_graphics(self, path):
+        """
+        Returns the tiles of a tile sheet as surface list, see import_cut_graphics() in support.py.
+
+        Parameters
+        ----------
+        path : str
+            path of the tile sheet
+
+        Returns
+        ----------
+        list : shared surface list of image-parts, must not be modified
+        """
+        def load():
+            tiles = self.atlas_index().get('sheets', {}).get(normpath(path))
+            if tiles:
+                return [self.atlas_frame(entry) for entry in tiles], 0
+            surfaces = import_cut_graphics(path, self.decode)
+            return surfaces, sum(self.surface_size(surface) for surface in surfaces)
+
+        return self.fetch(('cut', normpath(path)), load)
+
+    def font(self, path, size):
+        """
+        Returns a font, shared by all menus and messages. Fonts hold no pixel data and do not count to the budget.
+
+        Parameters
+        ----------
+        path : str
+            path of the font file
+        size : int
+            font size
+
+        Returns
+        ----------
+        pygame.font.Font : shared font
+        """
+        return self.fetch(('font', normpath(path), size), lambda: (pygame.font.Font(path, size), 0))
+
+    def clear(self):
+        """
+        Drops all cached assets, e.g. if the display mode changed and surfaces have to be converted again.
+        """
+        self.entries.clear()
+        self.pages.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Returns cache statistics for debugging and benchmarks.
+
+        Returns
+        ----------
+        dict : number of entries and pinned atlas pages, cached bytes, budget, hits, misses and evictions
+        """
+        return {'entries': len(self.entries), 'pages': len(self.pages), 'bytes': self.size, 'budget': self.budget,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+# process-wide registry shared by all modules
+assets = AssetRegistry()
@@ -0,0 +1,201 @@
+import json
+import os
+from os.path import dirname, join, normpath
+
+import pygame
+
+from settings import ATLAS_INDEX, ATLAS_PAGE_SIZE
+from support import import_cut_graphics, import_folder
+
+# image-directories and single images packed into the atlas
+ATLAS_FOLDERS = ('../graphics/player/move', '../graphics/souleater/left', '../graphics/souleater/left_attack',
+                 '../graphics/souleater/left_idle', '../graphics/souleater/right', '../graphics/souleater/right_attack',
+                 '../graphics/souleater/right_idle', '../graphics/coins/gold', '../graphics/coins/silver',
+                 '../graphics/flowers', '../graphics/particles')
+ATLAS_IMAGES = ('../graphics/player/ring.png',)
+# tile sheets packed into the atlas tile by tile, see import_cut_graphics()
+ATLAS_SHEETS = ('../graphics/terrain/wall_tiles.png',)
+VERSION = 2
+
+
+def folder_files(path):
+    """
+    Returns the image files of a directory in the order import_folder() loads them.
+
+    Parameters
+    ----------
+    path : str
+        path of the directory
+
+    Returns
+    ----------
+    list : normalized image paths
+    """
+    return [normpath(path + '/' + image) for _, __, image_files in os.walk(path) for image in image_files]
+
+
+def source_paths():
+    """
+    Returns the paths of all image files the atlas is built from.
+
+    Returns
+    ----------
+    list : normalized source paths
+    """
+    paths = [path for folder in ATLAS_FOLDERS for path in folder_files(folder)]
+    return paths + [normpath(path) for path in ATLAS_IMAGES + ATLAS_SHEETS]
+
+
+def read_index(index_path=ATLAS_INDEX):
+    """
+    Reads the atlas index as written by build_atlas().
+
+    Parameters
+    ----------
+    index_path : str
+        path of the atlas index
+
+    Returns
+    ----------
+    dict : atlas index, None if there is no index
+    """
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path) as index_file:
+        return json.load(index_file)
+
+
+def is_stale(index_path=ATLAS_INDEX):
+    """
+    Checks whether the atlas is missing, of an older format, built from other files than the current sources (images
+    added to or removed from a folder) or older than one of its sources.
+
+    Parameters
+    ----------
+    index_path : str
+        path of the atlas index
+
+    Returns
+    ----------
+    bool : True if the atlas has to be built
+    """
+    index = read_index(index_path)
+    sources = source_paths()
+    if index is None or index.get('version') != VERSION or index.get('sources') != sources:
+        return True
+    built_time = os.path.getmtime(index_path)
+    return any(os.path.getmtime(source) > built_time for source in sources)
+
+
+def pack(sizes, page_size=ATLAS_PAGE_SIZE):
+    """
+    Places rectangles on pages of page_size width by shelf packing: rectangles are sorted by height and placed left to
+    right on shelves, a new shelf starts below the highest rectangle of the last one and a new page when a page is full.
+
+    Parameters
+    ----------
+    sizes : list
+        (width, height) of every rectangle, each at most page_size wide and high
+    page_size : int
+        edge length of a page in pixel
+
+    Returns
+    ----------
+    list : (page, x, y) of every rectangle in the order of sizes
+    list : (width, height) of every page, cropped to the used height
+    """
+    places = [None] * len(sizes)
+    pages = []
+    x = y = shelf_height = 0
+    for index in sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0])):
+        width, height = sizes[index]
+        if x + width > page_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if not pages or y + height > page_size:
+            pages.append([page_size, 0])
+            x = y = shelf_height = 0
+        places[index] = (len(pages) - 1, x, y)
+        pages[-1][1] = max(pages[-1][1], y + height)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return places, [tuple(page) for page in pages]
+
+
+def build_atlas(index_path=ATLAS_INDEX):
+    """
+    Packs all frames of ATLAS_FOLDERS, ATLAS_IMAGES and the tiles of ATLAS_SHEETS into atlas pages and writes the
+    pages as png files next to a json index. The index lists the source files and maps every source image to (page, x,
+    y, width, height), every folder to its images in the order of import_folder() and every tile sheet to the rects of
+    its tiles. Frames are copied exactly as the asset registry would load them, so drawing from the atlas gives the
+    same pixels. Needs a display mode for convert_alpha(). The index is written to a temporary path and moved in place
+    last, so readers never see a partial atlas.
+
+    Parameters
+    ----------
+    index_path : str
+        path of the atlas index
+    """
+    frames = []  # (key, surface), key is an image path or (sheet path, tile index)
+    folders = {}
+    for folder in ATLAS_FOLDERS:
+        folders[normpath(folder)] = folder_files(folder)
+        frames += zip(folders[normpath(folder)], import_folder(folder))
+    for path in ATLAS_IMAGES:
+        frames.append((normpath(path), pygame.image.load(path).convert_alpha()))
+    for path in ATLAS_SHEETS:
+        frames += [((normpath(path), tile), surface) for tile, surface in enumerate(import_cut_graphics(path))]
+
+    places, page_sizes = pack([surface.get_size() for _, surface in frames])
+    pages = [pygame.Surface(size, flags=pygame.SRCALPHA) for size in page_sizes]
+    images = {}
+    sheets = {normpath(path): [] for path in ATLAS_SHEETS}
+    for (key, surface), (page, x, y) in zip(frames, places):
+        # max-blending onto the transparent page copies the pixels without alpha blending them
+        pages[page].blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        entry = [page, x, y, *surface.get_size()]
+        if isinstance(key, tuple):
+            sheets[key[0]].append(entry)
+        else:
+            images[key] = entry
+
+    directory = dirname(index_path)
+    os.makedirs(directory, exist_ok=True)
+    page_files = []
+    for number, page in enumerate(pages):
+        page_files.append(f'atlas_{number}.png')
+        pygame.image.save(page, join(directory, page_files[-1]))
+
+    temporary_path = f'{index_path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'w') as index_file:
+        json.dump({'version': VERSION, 'sources': source_paths(), 'pages': page_files, 'images': images,
+                   'folders': folders, 'sheets': sheets}, index_file)
+    os.replace(temporary_path, index_path)
+
+
+def load_atlas(index_path=ATLAS_INDEX):
+    """
+    Returns the atlas index, if the atlas was built and is up to date.
+
+    Parameters
+    ----------
+    index_path : str
+        path of the atlas index
+
+    Returns
+    ----------
+    dict : index (see build_atlas()) with the page paths relative to the code directory, None if the atlas is missing
+    or stale (see is_stale())
+    """
+    if is_stale(index_path):
+        return None
+    index = read_index(index_path)
+    index['pages'] = [normpath(join(dirname(index_path), page)) for page in index['pages']]
+    return index
+
+
+if __name__ == '__main__':
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    build_atlas()
+    atlas = load_atlas()
+    print(f'built atlas {ATLAS_INDEX}: {len(atlas["images"])} images and '
+          f'{sum(len(tiles) for tiles in atlas["sheets"].values())} tiles on {len(atlas["pages"])} pages')
@@ -0,0 +1,199 @@
+from math import dist
+
+import pygame
+
+from game_data import sound_data
+from settings import AUDIO_CHANNELS, AUDIO_HEARING_RADIUS
+from simulation import ms_to_ticks, sim_clock
+
+
+class AudioManager:
+    """
+    A class to play all sounds of the game. Every sound of game_data.sound_data is loaded once and shared. A sound is
+    not played if its voice limit is reached or its retrigger cooldown has not passed yet. If all channels are busy, the
+    channel playing the sound of lowest priority is taken over, as long as its priority is lower than the new one.
+    Sounds with a position are attenuated by their distance to the listener (the player) and not played beyond
+    AUDIO_HEARING_RADIUS. Without mixer (e.g. no audio device) all sounds are dropped silently.
+
+    Attributes
+    ----------
+    sounds : dict
+        sound name mapped to its loaded pygame.mixer.Sound
+    channel_sounds : list
+        name of the sound last started on each channel
+    last_played : dict
+        sound name mapped to the simulation tick it was started last
+    listener : (x,y)
+        position of the listener for distance attenuation, None to play positioned sounds at full volume
+    stats_counter : dict
+        number of played, stolen and dropped triggers
+    """
+
+    def __init__(self):
+        self.sounds = {}
+        self.channel_sounds = []
+        self.last_played = {}
+        self.listener = None
+        self.stats_counter = {'played': 0, 'stolen': 0, 'dropped_voices': 0, 'dropped_cooldown': 0,
+                              'dropped_channels': 0, 'dropped_inaudible': 0, 'dropped_no_mixer': 0}
+
+    def sound(self, name):
+        """
+        Returns the loaded sound, loads it on first request.
+
+        Parameters
+        ----------
+        name : str
+            key of the sound in game_data.sound_data
+
+        Returns
+        ----------
+        pygame.mixer.Sound : shared sound, None without mixer
+        """
+        if not self.mixer_ready():
+            return None
+        if name not in self.sounds:
+            self.sounds[name] = pygame.mixer.Sound(sound_data[name]['path'])
+        return self.sounds[name]
+
+    def mixer_ready(self):
+        """
+        Checks whether the mixer is initialized and sets up AUDIO_CHANNELS channels on first use.
+
+        Returns
+        ----------
+        bool : True if sounds can be played
+        """
+        if not pygame.mixer.get_init():
+            return False
+        if len(self.channel_sounds) != AUDIO_CHANNELS:
+            pygame.mixer.set_num_channels(AUDIO_CHANNELS)
+            self.channel_sounds = [None] * AUDIO_CHANNELS
+        return True
+
+    def load_all(self):
+        """
+        Loads every sound of game_data.sound_data in advance.
+        """
+        for name in sound_data:
+            self.sound(name)
+
+    def playing(self):
+        """
+        Returns the names of the sounds currently playing, one per busy channel.
+
+        Returns
+        ----------
+        list : (channel index, sound name) of every busy channel
+        """
+        return [(index, name) for index, name in enumerate(self.channel_sounds)
+                if name and pygame.mixer.Channel(index).get_busy()]
+
+    def find_channel(self, priority):
+        """
+        Returns the index of a free channel or of the busy channel with the lowest priority below priority.
+
+        Parameters
+        ----------
+        priority : int
+            priority of the sound to play
+
+        Returns
+        ----------
+        int : channel index, None if every channel plays a sound of at least the same priority
+        """
+        busy = self.playing()
+        busy_indices = {index for index, _ in busy}
+        for index in range(len(self.channel_sounds)):
+            if index not in busy_indices:
+                return index
+
+        lowest_index, lowest_name = min(busy, key=lambda entry: sound_data[entry[1]]['priority'])
+        if sound_data[lowest_name]['priority'] < priority:
+            self.stats_counter['stolen'] += 1
+            return lowest_index
+        return None
+
+    def volume(self, name, position):
+        """
+        Returns the volume of a sound at position, attenuated linearly by the distance to the listener.
+
+        Parameters
+        ----------
+        name : str
+            key of the sound in game_data.sound_data
+        position : (x,y)
+            position of the sound source, None for sounds without position
+
+        Returns
+        ----------
+        float : volume between 0 and the volume of the sound
+        """
+        volume = sound_data[name]['volume']
+        if position is None or self.listener is None:
+            return volume
+        return volume * max(0.0, 1 - dist(position, self.listener) / AUDIO_HEARING_RADIUS)
+
+    def play(self, name, position=None):
+        """
+        Plays a sound unless it is throttled by its voice limit or cooldown, inaudible or no channel is available.
+
+        Parameters
+        ----------
+        name : str
+            key of the sound in game_data.sound_data
+        position : (x,y)
+            position of the sound source for distance attenuation, None for sounds without position
+
+        Returns
+        ----------
+        pygame.mixer.Channel : channel the sound is played on, None if it was dropped
+        """
+        sound = self.sound(name)
+        if sound is None:
+            self.stats_counter['dropped_no_mixer'] += 1
+            return None
+
+        data = sound_data[name]
+        last_played = self.last_played.get(name)
+        if last_played is not None and 0 <= sim_clock.ticks - last_played < ms_to_ticks(data['cooldown']):
+            self.stats_counter['dropped_cooldown'] += 1
+            return None
+        if sum(1 for _, playing_name in self.playing() if playing_name == name) >= data['voices']:
+            self.stats_counter['dropped_voices'] += 1
+            return None
+        volume = self.volume(name, position)
+        if volume <= 0:
+            self.stats_counter['dropped_inaudible'] += 1
+            return None
+
+        index = self.find_channel(data['priority'])
+        if index is None:
+            self.stats_counter['dropped_channels'] += 1
+            return None
+
+        channel = pygame.mixer.Channel(index)
+        channel.play(sound)
+        channel.set_volume(volume)
+        self.channel_sounds[index] = name
+        self.last_played[name] = sim_clock.ticks
+        self.stats_counter['played'] += 1
+        return channel
+
+    def stats(self):
+        """
+        Returns audio statistics for debugging and benchmarks.
+
+        Returns
+        ----------
+        dict : voices in use (in total and per sound), channels, loaded sounds and trigger counters
+        """
+        voices = {}
+        for _, name in self.playing():
+            voices[name] = voices.get(name, 0) + 1
+        return {'voices': sum(voices.values()), 'voices_per_sound': voices, 'channels': len(self.channel_sounds),
+                'loaded': len(self.sounds), **self.stats_counter}
+
+
+# process-wide audio manager
+audio = AudioManager()
@@ -0,0 +1,157 @@
+import json
+import os
+import random
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from time import perf_counter
+
+from benchmarks.maze import generate_level
+from benchmarks.stages import summarize
+from bots import BOT_POLICIES
+from controls import controls
+from game_data import levels
+from headless import HeadlessLevel
+from level_compiler import load_level
+from replay import seed_simulation
+from settings import BATCH_TICKS
+from simulation import sim_clock
+
+
+def simulate(spec):
+    """
+    Runs one headless level simulation in a worker process and returns its metrics. The player is controlled by a
+    bot policy or an input script, all random decisions are drawn from generators seeded with the seed of the run,
+    so every run can be repeated exactly.
+
+    Parameters
+    ----------
+    spec : dict
+        level (key in game_data.levels), level_data (entry of a generated level, None for shipped levels), agent
+        (bot policy name or script path), script (input steps, None for bots), seed, ticks (maximum) and render
+
+    Returns
+    ----------
+    dict : level, agent, seed, result, ticks, coins, health, tick_ms (statistics of the simulation steps), seconds and
+    ticks_per_second of the run
+    """
+    if spec['level_data']:
+        levels[spec['level']] = spec['level_data']
+    sim_clock.reset()
+    seed_simulation(spec['seed'])
+    run = HeadlessLevel(spec['level'], spec['script'] or (), True, spec['render'])
+    if spec['script'] is None:
+        controls.source = BOT_POLICIES[spec['agent']](run.level, random.Random(spec['seed']))
+
+    samples = []
+    start = perf_counter()
+    while run.ticks < spec['ticks'] and run.result == 'running':
+        step_start = perf_counter()
+        run.step()
+        samples.append(perf_counter() - step_start)
+    seconds = perf_counter() - start
+
+    player = run.level.player
+    return {'level': spec['level'], 'agent': spec['agent'], 'seed': spec['seed'],
+            'result': run.result if run.result != 'running' else 'timeout',
+            'ticks': run.ticks,
+            'coins': player.coins,
+            'health': player.health,
+            'tick_ms': summarize(samples) if samples else None,
+            'seconds': seconds,
+            'ticks_per_second': run.ticks / seconds if seconds else 0.0}
+
+
+def summarize_runs(results):
+    """
+    Aggregates the runs of every combination of level and agent.
+
+    Parameters
+    ----------
+    results : list
+        metrics of all runs, see simulate()
+
+    Returns
+    ----------
+    list : per level and agent the number of runs, wins, deaths and timeouts, the mean ticks to win and to death,
+    the mean coins and the worst p99 and max step time in milliseconds
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((str(result['level']), result['agent']), []).append(result)
+
+    summary = []
+    for (level, agent), runs in sorted(groups.items()):
+        wins = [run['ticks'] for run in runs if run['result'] == 'win']
+        deaths = [run['ticks'] for run in runs if run['result'] == 'game_over']
+        timed = [run['tick_ms'] for run in runs if run['tick_ms']]
+        summary.append({'level': level, 'agent': agent, 'runs': len(runs),
+                        'wins': len(wins), 'deaths': len(deaths), 'timeouts': len(runs) - len(wins) - len(deaths),
+                        'ticks_to_win': sum(wins) / len(wins) if wins else None,
+                        'ticks_to_death': sum(deaths) / len(deaths) if deaths else None,
+                        'coins': sum(run['coins'] for run in runs) / len(runs),
+                        'p99_ms': max((stats['p99_ms'] for stats in timed), default=None),
+                        'max_ms': max((stats['max_ms'] for stats in timed), default=None)})
+    return summary
+
+
+def main():
+    """
+    Command line entry point: runs every combination of level, agent and seed in a pool of worker processes and
+    writes the metrics of all runs and a summary per level and agent as json file.
+    """
+    parser = ArgumentParser(description='Run many headless Maze Light simulations in parallel.')
+    parser.add_argument('--levels', type=int, nargs='*', default=[], help='indices of shipped levels')
+    parser.add_argument('--mazes', type=int, nargs='*', default=[], help='edge lengths of generated mazes')
+    parser.add_argument('--maze-seed', type=int, default=0, help='seed for maze generation')
+    parser.add_argument('--policies', nargs='*', default=['seeker'], choices=sorted(BOT_POLICIES),
+                        help='bot policies controlling the player')
+    parser.add_argument('--scripts', nargs='*', default=[],
+                        help='json files with input steps [[ticks, ["up", "space"]], ...], repeated until the end')
+    parser.add_argument('--seeds', type=int, default=1, help='runs per level and agent, seeded 0, 1, ...')
+    parser.add_argument('--ticks', type=int, default=BATCH_TICKS, help='maximum simulation ticks per run')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--render', action='store_true', help='draw every tick to an off-screen surface')
+    parser.add_argument('--output', default='batch_results.json', help='result file')
+    args = parser.parse_args()
+
+    # generated mazes are written and compiled once, the workers only read them
+    maps = [(index, None) for index in args.levels]
+    for size in args.mazes:
+        key = generate_level(size, seed=args.maze_seed)
+        load_level(levels[key])
+        maps.append((key, levels[key]))
+
+    agents = [(policy, None) for policy in args.policies]
+    for path in args.scripts:
+        with open(path) as script_file:
+            agents.append((path, json.load(script_file)))
+
+    specs = [{'level': level, 'level_data': level_data, 'agent': agent, 'script': script, 'seed': seed,
+              'ticks': args.ticks, 'render': args.render}
+             for (level, level_data), (agent, script), seed in product(maps, agents, range(args.seeds))]
+
+    start = perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for future in as_completed([executor.submit(simulate, spec) for spec in specs]):
+            result = future.result()
+            results.append(result)
+            print(f'[{len(results)}/{len(specs)}] level {result["level"]} {result["agent"]} seed {result["seed"]}: '
+                  f'{result["result"]} after {result["ticks"]} ticks, {result["coins"]} coins')
+    seconds = perf_counter() - start
+
+    results.sort(key=lambda result: (str(result['level']), result['agent'], result['seed']))
+    summary = summarize_runs(results)
+    with open(args.output, 'w') as result_file:
+        json.dump({'workers': args.workers, 'seconds': seconds, 'summary': summary, 'runs': results}, result_file,
+                  indent=2)
+
+    print(f'{len(results)} runs in {seconds:.1f} s with {args.workers} workers, results in {args.output}')
+    for group in summary:
+        print(f'level {group["level"]} {group["agent"]}: {group["wins"]} wins, {group["deaths"]} deaths, '
+              f'{group["timeouts"]} timeouts of {group["runs"]} runs, mean coins {group["coins"]:.0f}')
+
+
+if __name__ == '__main__':
+    main()
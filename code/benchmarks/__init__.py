@@ -0,0 +1,3 @@
+"""
+Benchmarks for the hot paths of Maze Light. Run from the code directory, e.g. python -m benchmarks.camera_draw
+"""
@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from assets import assets
+from level import Level
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH, TILE_SIZE
+from tiles import AnimatedTile
+
+
+def legacy_draw(group, player):
+    """
+    Reference implementation of the former CameraGroup.camera_draw(): sorts all sprites and blits them one by one.
+
+    Parameters
+    ----------
+    group : CameraGroup
+        camera group of the level
+    player : Player
+        player-object
+    """
+    group.offset.x = player.rect.centerx - group.half_width
+    group.offset.y = player.rect.centery - group.half_height
+    group.static_layer.draw(group.display_surface, group.offset)
+    for sprite in sorted(group.sprites(), key=lambda sprite: sprite.rect.centery):
+        group.display_surface.blit(sprite.image, sprite.rect.topleft - group.offset)
+
+
+def current_draw(group, player):
+    """
+    Draws one frame with CameraGroup.camera_draw().
+    """
+    group.camera_draw(player)
+
+
+def time_draw(draw, group, player, frames):
+    """
+    Returns the mean time of a draw function in milliseconds.
+    """
+    start = perf_counter()
+    for _ in range(frames):
+        draw(group, player)
+    return (perf_counter() - start) / frames * 1000
+
+
+def main(sprite_counts=(0, 1000, 5000, 20000, 50000), frames=200, seed=0):
+    """
+    Fills level 0 with additional coins spread over a 500x500 tile area and compares the frame time of
+    CameraGroup.camera_draw() with the legacy pipeline for growing sprite counts.
+
+    Parameters
+    ----------
+    sprite_counts : tuple
+        amounts of extra sprites to measure
+    frames : int
+        frames to draw per measurement
+    seed : int
+        seed for the sprite placement
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    rng = random.Random(seed)
+    surface = assets.image('../graphics/coins/silver/0.png')
+    print(f'{"sprites":>8} {"camera_draw ms":>15} {"legacy ms":>10}')
+    for count in sprite_counts:
+        level = Level(0, screen, None)
+        group = level.visible_sprites
+        for _ in range(count):
+            pos = (rng.randrange(500) * TILE_SIZE, rng.randrange(500) * TILE_SIZE)
+            AnimatedTile(pos, [group], 'silver', surface, '../graphics/coins/silver')
+
+        group.camera_draw(level.player)
+        current = time_draw(current_draw, group, level.player, frames)
+        legacy = time_draw(legacy_draw, group, level.player, max(frames // 10, 1))
+        print(f'{len(group):>8} {current:>15.3f} {legacy:>10.3f}')
+
+
+if __name__ == '__main__':
+    main(frames=int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,112 @@
+import os
+import random
+from csv import writer
+
+from game_data import levels
+
+WALL_ID = 13
+
+
+def carve_maze(width, height, rng):
+    """
+    Creates a perfect maze with an iterative recursive backtracker. Cells with odd coordinates are rooms, the walls
+    between two rooms are removed while carving.
+
+    Parameters
+    ----------
+    width : int
+        number of tiles per row (made odd)
+    height : int
+        number of rows (made odd)
+    rng : random.Random
+        random number generator
+
+    Returns
+    ----------
+    list : rows of bools, True for wall tiles
+    """
+    width -= 1 - width % 2
+    height -= 1 - height % 2
+    grid = [[True] * width for _ in range(height)]
+    grid[1][1] = False
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        neighbours = [(x + dx, y + dy, dx, dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                      if 0 < x + dx < width - 1 and 0 < y + dy < height - 1 and grid[y + dy][x + dx]]
+        if neighbours:
+            nx, ny, dx, dy = rng.choice(neighbours)
+            grid[y + dy // 2][x + dx // 2] = False
+            grid[ny][nx] = False
+            stack.append((nx, ny))
+        else:
+            stack.pop()
+    return grid
+
+
+def generate_level(size, coin_density=0.05, flower_density=0.01, souleater_density=0.002, seed=0,
+                   directory='../levels/generated', floor='../graphics/terrain/floor_0.png'):
+    """
+    Generates a square maze level with randomly placed coins, flowers and souleaters, writes its csv layers and
+    registers it in game_data.levels. The player starts in the top left corner, the goal is placed in the bottom right
+    corner.
+
+    Parameters
+    ----------
+    size : int
+        edge length of the maze in tiles
+    coin_density : float
+        share of floor tiles with a coin, every fifth coin is gold
+    flower_density : float
+        share of floor tiles with a flower
+    souleater_density : float
+        share of floor tiles with a souleater
+    seed : int
+        seed for maze and object placement
+    directory : str
+        directory for the csv layers
+    floor : str
+        path of the floor image
+
+    Returns
+    ----------
+    str : key of the level in game_data.levels
+    """
+    rng = random.Random(seed)
+    walls = carve_maze(size, size, rng)
+    rows, cols = len(walls), len(walls[0])
+    layers = {style: [[-1] * cols for _ in range(rows)] for style in ('walls', 'coins', 'flowers', 'enemies', 'player')}
+
+    floor_tiles = []
+    for y, row in enumerate(walls):
+        for x, wall in enumerate(row):
+            if wall:
+                layers['walls'][y][x] = WALL_ID
+            else:
+                floor_tiles.append((x, y))
+
+    # player start and goal
+    start, goal = floor_tiles[0], floor_tiles[-1]
+    layers['player'][start[1]][start[0]] = 0
+    layers['player'][goal[1]][goal[0]] = 1
+
+    # pickups and enemies, keep the start free
+    for x, y in floor_tiles[1:-1]:
+        chance = rng.random()
+        if chance < souleater_density:
+            layers['enemies'][y][x] = 0
+        elif chance < souleater_density + flower_density:
+            layers['flowers'][y][x] = 0
+        elif chance < souleater_density + flower_density + coin_density:
+            layers['coins'][y][x] = 0 if rng.random() < 0.2 else 1
+
+    key = f'generated_{size}_{seed}'
+    os.makedirs(directory, exist_ok=True)
+    level_data = {'floor': floor, 'unlock': 0}
+    for style, layout in layers.items():
+        path = os.path.join(directory, f'{key}_{style}.csv')
+        with open(path, 'w', newline='') as csv_file:
+            writer(csv_file).writerows(layout)
+        level_data[style] = path
+    levels[key] = level_data
+    return key
@@ -0,0 +1,143 @@
+import json
+import platform
+import random
+from argparse import ArgumentParser
+from statistics import mean, median
+from time import perf_counter
+
+import pygame
+
+from benchmarks.maze import generate_level
+from headless import init_headless
+from level import Level
+
+
+class TimedLevel(Level):
+    """
+    A Level which measures the duration of create_map().
+
+    Attributes
+    ----------
+    create_map_time : float
+        duration of create_map() in seconds
+    """
+
+    def create_map(self):
+        """
+        Calls Level.create_map() and stores its duration.
+        """
+        start = perf_counter()
+        super().create_map()
+        self.create_map_time = perf_counter() - start
+
+
+def summarize(samples):
+    """
+    Summarizes durations in seconds as milliseconds.
+
+    Parameters
+    ----------
+    samples : list
+        measured durations in seconds
+
+    Returns
+    ----------
+    dict : mean, p50, p99 and max in milliseconds
+    """
+    ordered = sorted(samples)
+    return {'mean_ms': mean(ordered) * 1000,
+            'p50_ms': median(ordered) * 1000,
+            'p99_ms': ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] * 1000,
+            'max_ms': ordered[-1] * 1000}
+
+
+def measure(function, samples):
+    """
+    Calls function and appends its duration to samples.
+    """
+    start = perf_counter()
+    function()
+    samples.append(perf_counter() - start)
+
+
+def benchmark_level(level_key, frames, seed):
+    """
+    Builds a level and times every stage of a frame separately.
+
+    Parameters
+    ----------
+    level_key : int or str
+        key of the level in game_data.levels
+    frames : int
+        number of frames to measure
+    seed : int
+        seed for the player movement
+
+    Returns
+    ----------
+    dict : sprite counts (walls, registered sprites by kind, see SpriteRegistry.counts()) and timing summary of every
+    stage
+    """
+    surface = init_headless()
+    rng = random.Random(seed)
+    level = TimedLevel(level_key, surface, None)
+    player = level.player
+    group = level.visible_sprites
+    stages = {'camera_draw': [], 'ui_display': [], 'sprite_update': [], 'collision': [], 'enemy_update': []}
+
+    for _ in range(frames):
+        measure(lambda: group.camera_draw(player), stages['camera_draw'])
+        measure(lambda: level.ui.display(player), stages['ui_display'])
+        measure(level.update_sprites, stages['sprite_update'])
+
+        # random walk of the player: Player.move() runs item_collection() and collision() on both axes
+        player.direction = pygame.math.Vector2(rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        measure(lambda: player.move(player.speed), stages['collision'])
+        measure(lambda: level.swarm.update(player), stages['enemy_update'])
+
+    return {'level': level_key,
+            'counts': {'walls': int(level.walls.solid.sum()),
+                       **level.registry.counts(),
+                       'visible_sprites': len(group)},
+            'stages': {'create_map': {'total_ms': level.create_map_time * 1000},
+                       **{name: summarize(samples) for name, samples in stages.items()}}}
+
+
+def main():
+    """
+    Command line entry point: generates mazes of the given sizes, benchmarks them and writes the results as json.
+    """
+    parser = ArgumentParser(description='Time the hot paths of Maze Light on generated mazes.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[25, 50, 100, 200, 500], help='maze edge lengths')
+    parser.add_argument('--coins', type=float, default=0.05, help='share of floor tiles with coins')
+    parser.add_argument('--flowers', type=float, default=0.01, help='share of floor tiles with flowers')
+    parser.add_argument('--souleaters', type=float, default=0.002, help='share of floor tiles with souleaters')
+    parser.add_argument('--frames', type=int, default=300, help='frames measured per maze')
+    parser.add_argument('--seed', type=int, default=0, help='seed for maze generation and movement')
+    parser.add_argument('--shipped', action='store_true', help='benchmark the shipped levels as well')
+    parser.add_argument('--output', default='benchmark_results.json', help='result file')
+    args = parser.parse_args()
+
+    init_headless()
+    keys = list(range(3)) if args.shipped else []
+    keys += [generate_level(size, args.coins, args.flowers, args.souleaters, args.seed) for size in args.sizes]
+
+    runs = []
+    for key in keys:
+        result = benchmark_level(key, args.frames, args.seed)
+        runs.append(result)
+        stages = result['stages']
+        print(f'{key}: ' + ', '.join(f'{name} {stage.get("mean_ms", stage.get("total_ms")):.3f} ms'
+                                     for name, stage in stages.items()))
+
+    results = {'meta': {'python': platform.python_version(), 'pygame': pygame.version.ver,
+                        'platform': platform.platform(), 'frames': args.frames, 'seed': args.seed,
+                        'densities': {'coins': args.coins, 'flowers': args.flowers,
+                                      'souleaters': args.souleaters}},
+               'runs': runs}
+    with open(args.output, 'w') as result_file:
+        json.dump(results, result_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import numpy as np
+import pygame
+
+from controls import KeyState
+from level_compiler import LAYERS
+from pathfinding import FlowField
+from settings import BOT_LIGHT_CHANCE, BOT_MAX_HOLD, BOT_MIN_HOLD, TILE_SIZE
+from simulation import sim_clock
+
+# directions of the random walk: standing still, four straight and four diagonal directions
+BOT_DIRECTIONS = ((), (pygame.K_UP,), (pygame.K_DOWN,), (pygame.K_LEFT,), (pygame.K_RIGHT,),
+                  (pygame.K_UP, pygame.K_LEFT), (pygame.K_UP, pygame.K_RIGHT), (pygame.K_DOWN, pygame.K_LEFT),
+                  (pygame.K_DOWN, pygame.K_RIGHT))
+
+
+class IdleBot:
+    """
+    A class to play a level without pressing any key, e.g. to measure how fast the souleaters find a player who stays
+    at the start.
+
+    Parameters
+    ----------
+    level : Level
+        level to play
+    rng : random.Random
+        random number generator of the run
+
+    Attributes
+    ----------
+    released : KeyState
+        state without pressed keys
+    """
+
+    def __init__(self, level, rng):
+        self.released = KeyState()
+
+    def get_pressed(self):
+        """
+        Returns the key state of the current simulation tick.
+
+        Returns
+        ----------
+        KeyState : no pressed keys
+        """
+        return self.released
+
+
+class RandomWalkBot:
+    """
+    A class to play a level by walking in random directions. Every direction of BOT_DIRECTIONS is held for a random
+    number of ticks between BOT_MIN_HOLD and BOT_MAX_HOLD. At every change of direction the light is switched with a
+    chance of BOT_LIGHT_CHANCE, space is pressed for one tick.
+
+    Parameters
+    ----------
+    level : Level
+        level to play
+    rng : random.Random
+        random number generator of the run
+
+    Attributes
+    ----------
+    rng : random.Random
+        see Parameters
+    walk : KeyState
+        keys of the current direction
+    switch : KeyState
+        keys of the current direction and space
+    switch_tick : int
+        simulation tick space is pressed, None if the light is not switched
+    change_tick : int
+        simulation tick of the next change of direction
+    """
+
+    def __init__(self, level, rng):
+        self.rng = rng
+        self.walk = KeyState()
+        self.switch = KeyState()
+        self.switch_tick = None
+        self.change_tick = sim_clock.ticks
+
+    def get_pressed(self):
+        """
+        Returns the key state of the current simulation tick, picks a new direction if the current one was held
+        long enough.
+
+        Returns
+        ----------
+        KeyState : pressed state for every key
+        """
+        tick = sim_clock.ticks
+        if tick >= self.change_tick:
+            keys = self.rng.choice(BOT_DIRECTIONS)
+            self.walk = KeyState(keys)
+            self.switch = KeyState(keys + (pygame.K_SPACE,))
+            self.switch_tick = tick if self.rng.random() < BOT_LIGHT_CHANCE else None
+            self.change_tick = tick + self.rng.randint(BOT_MIN_HOLD, BOT_MAX_HOLD)
+        return self.switch if tick == self.switch_tick else self.walk
+
+
+class GoalSeekerBot:
+    """
+    A class to play a level by walking the shortest way through the maze to the goal, read from a flow field over the
+    walls of the level. Items on the way are collected, souleaters are ignored and the light stays on.
+
+    Parameters
+    ----------
+    level : Level
+        level to play
+    rng : random.Random
+        random number generator of the run
+
+    Attributes
+    ----------
+    player : Player
+        player of the level
+    field : FlowField
+        flow field to the goal tile over the whole level
+    """
+
+    def __init__(self, level, rng):
+        self.player = level.player
+        goal_row, goal_col = np.argwhere(level.streamer.layouts[LAYERS.index('player')] == 1)[0].tolist()
+        self.field = FlowField(level.walls.solid, (goal_col, goal_row), None)
+
+    def get_pressed(self):
+        """
+        Returns the keys leading from the player position to the center of the next tile on the way to the goal.
+
+        Returns
+        ----------
+        KeyState : pressed state for every key
+        """
+        hitbox = self.player.hitbox
+        col, row = hitbox.centerx // TILE_SIZE, hitbox.centery // TILE_SIZE
+        next_col, next_row = self.field.next_step.get((col, row), (col, row))
+        tile_rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        dx = tile_rect.centerx - hitbox.centerx
+        dy = tile_rect.centery - hitbox.centery
+
+        # step towards the next tile, while the hitbox does not fit between the walls of the current tile it is
+        # moved towards the center of the tile as well (collisions with walls stop the blocked part of the move)
+        keys = []
+        if next_col != col:
+            keys.append(pygame.K_RIGHT if next_col > col else pygame.K_LEFT)
+        elif hitbox.left < tile_rect.left or hitbox.right > tile_rect.right or \
+                (next_row == row and abs(dx) > self.player.speed / 2):
+            keys.append(pygame.K_RIGHT if dx > 0 else pygame.K_LEFT)
+        if next_row != row:
+            keys.append(pygame.K_DOWN if next_row > row else pygame.K_UP)
+        elif hitbox.top < tile_rect.top or hitbox.bottom > tile_rect.bottom or \
+                (next_col == col and abs(dy) > self.player.speed / 2):
+            keys.append(pygame.K_DOWN if dy > 0 else pygame.K_UP)
+        return KeyState(keys)
+
+
+# bot policies by name
+BOT_POLICIES = {'idle': IdleBot, 'random': RandomWalkBot, 'seeker': GoalSeekerBot}
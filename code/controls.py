@@ -0,0 +1,130 @@
+from bisect import bisect
+
+import pygame
+
+from simulation import sim_clock
+
+
+class KeyState:
+    """
+    A class mimicking the sequence returned by pygame.key.get_pressed() for a set of pressed keys.
+
+    Parameters
+    ----------
+    pressed : set
+        key codes of the pressed keys
+
+    Attributes
+    ----------
+    pressed : frozenset
+        see Parameters
+    """
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class KeyboardInput:
+    """
+    A class to read the real keyboard state via pygame.key.get_pressed().
+    """
+
+    def get_pressed(self):
+        """
+        Returns the current keyboard state.
+
+        Returns
+        ----------
+        pygame.key.ScancodeWrapper : pressed state for every key
+        """
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    """
+    A class to replay a fixed input script instead of the keyboard, e.g. to run levels without a display. The script
+    is a list of steps (ticks, keys): the keys are held for the given number of simulation ticks. Keys are given as
+    pygame key codes or key names like 'up' or 'space'. Ticks are counted from the creation of the input.
+
+    Parameters
+    ----------
+    script : list
+        steps (ticks, keys) to play
+    loop : bool
+        if True the script restarts after the last step, otherwise no key is pressed afterwards
+
+    Attributes
+    ----------
+    starts : list
+        first tick of every step
+    states : list
+        KeyState of every step
+    length : int
+        total amount of ticks of the script
+    loop : bool
+        see Parameters
+    start_tick : int
+        simulation tick the script started at
+    released : KeyState
+        state without pressed keys, returned after the script
+    """
+
+    def __init__(self, script, loop=False):
+        self.starts = []
+        self.states = []
+        self.length = 0
+        for ticks, keys in script:
+            codes = {pygame.key.key_code(key) if isinstance(key, str) else key for key in keys}
+            self.starts.append(self.length)
+            self.states.append(KeyState(codes))
+            self.length += ticks
+        self.loop = loop
+        self.start_tick = sim_clock.ticks
+        self.released = KeyState()
+
+    def get_pressed(self):
+        """
+        Returns the scripted key state of the current simulation tick.
+
+        Returns
+        ----------
+        KeyState : pressed state for every key
+        """
+        tick = sim_clock.ticks - self.start_tick
+        if self.loop and self.length:
+            tick %= self.length
+        if tick >= self.length:
+            return self.released
+        return self.states[bisect(self.starts, tick) - 1]
+
+
+class Controls:
+    """
+    A class to provide the input state for Player, Level, Menu and Message. The input source can be switched from the
+    keyboard to a scripted input.
+
+    Attributes
+    ----------
+    source : KeyboardInput or ScriptedInput
+        current input source
+    """
+
+    def __init__(self):
+        self.source = KeyboardInput()
+
+    def get_pressed(self):
+        """
+        Returns the key state of the current input source.
+
+        Returns
+        ----------
+        sequence : pressed state for every key, indexed by pygame key codes
+        """
+        return self.source.get_pressed()
+
+
+# process-wide input provider
+controls = Controls()
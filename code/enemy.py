@@ -1,4 +1,5 @@
 import pygame
+from assets import assets
 from settings import *
 from support import *
 from entity import Entity
@@ -56,7 +57,7 @@ class Enemy(Entity):
 
         for animation in self.animations.keys():
             full_path = enemy_path + animation
-            self.animations[animation] = import_folder(full_path)
+            self.animations[animation] = assets.folder(full_path)
 
     def get_player_distance_direction(self, player_pos):
         enemy_vec = pygame.math.Vector2(self.rect.center)
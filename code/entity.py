@@ -10,13 +10,17 @@ class Entity(pygame.sprite.Sprite):
     ----------
     groups : list[]
         determines the sprite groups the entity-object belongs to
-    obstacle_sprites: sprite.Group()
+    obstacle_sprites: spatial.GridGroup()
         group of sprites the entity-object is able to collide with
+    walls : spatial.WallGrid
+        walls of the level
 
     Attributes
     ----------
-    obstacle_sprites : sprite.Group()
-        group of sprites for collision detection with objects
+    obstacle_sprites : spatial.GridGroup()
+        grid indexed group of sprites for collision detection with objects
+    walls : spatial.WallGrid
+        see Parameters
     hitbox : pygame.Rect
         inflated Rect for environment interaction
     direction : pygame.math.Vector2()
@@ -24,12 +28,17 @@ class Entity(pygame.sprite.Sprite):
     frame_index : int
         index of image to be displayed for animation
     animation_speed : float
-        increment of frame_index to run animation
+        increment of frame_index per simulation tick to run animation
+    moving : bool
+        class attribute, marks entities as moving sprites for grid indexed groups
     """
-    def __init__(self, groups, obstacle_sprites):
+    moving = True
+
+    def __init__(self, groups, obstacle_sprites, walls):
         # general setup
         super().__init__(groups)
         self.obstacle_sprites = obstacle_sprites
+        self.walls = walls
         self.hitbox = None
 
         # movement
@@ -48,7 +57,7 @@ class Entity(pygame.sprite.Sprite):
             Parameters
             ----------
             speed : int
-                speed of entity
+                speed of entity in pixel per simulation tick
         """
         if self.direction.magnitude() != 0:
             # normalize vector to length=1
@@ -62,8 +71,9 @@ class Entity(pygame.sprite.Sprite):
 
     def collision(self, direction):
         """
-            Sub-method for checking whether a collision with an obstacle_sprite-hitbox has occurred. Sets the entity-
-            object back from obstacle_sprite-hitbox in according direction .
+            Sub-method for checking whether a collision with a wall or an obstacle_sprite-hitbox has occurred. Sets the
+            entity-object back from the obstacle hitbox in according direction. Only the walls and obstacles in the
+            grid cells the hitbox overlaps are tested.
 
             Parameters
             ----------
@@ -71,18 +81,30 @@ class Entity(pygame.sprite.Sprite):
                 vector to shift entity-object for movement
         """
         if direction == 'horizontal':
-            for sprite in self.obstacle_sprites:
-                if sprite.hitbox.colliderect(self.hitbox):
-                    if self.direction.x > 0:  # moving right
-                        self.hitbox.right = sprite.hitbox.left
-                    if self.direction.x < 0:  # moving right
-                        self.hitbox.left = sprite.hitbox.right
+            for hitbox in self.obstacle_hitboxes():
+                if self.direction.x > 0:  # moving right
+                    self.hitbox.right = hitbox.left
+                if self.direction.x < 0:  # moving right
+                    self.hitbox.left = hitbox.right
 
         if direction == 'vertical':
-            for sprite in self.obstacle_sprites:
-                if sprite.hitbox.colliderect(self.hitbox):
-                    if self.direction.y > 0:  # moving down
-                        self.hitbox.bottom = sprite.hitbox.top
-                    if self.direction.y < 0:  # moving up
-                        self.hitbox.top = sprite.hitbox.bottom
+            for hitbox in self.obstacle_hitboxes():
+                if self.direction.y > 0:  # moving down
+                    self.hitbox.bottom = hitbox.top
+                if self.direction.y < 0:  # moving up
+                    self.hitbox.top = hitbox.bottom
+
+    def obstacle_hitboxes(self):
+        """
+            Yields the hitboxes of all walls and obstacle sprites colliding with the hitbox of the entity-object, walls
+            first. The hitbox may be moved between two obstacles, following obstacles are tested against the moved
+            hitbox.
+
+            Yields
+            ----------
+            pygame.Rect : hitbox of the colliding obstacle
+        """
+        yield from self.walls.colliding(self.hitbox)
+        for sprite in self.obstacle_sprites.colliding(self.hitbox):
+            yield sprite.hitbox
 
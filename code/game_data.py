@@ -4,6 +4,8 @@ level_0 = {
     'flowers': '../levels/0/level_0_flowers.csv',
     'enemies': '../levels/0/level_0_enemies.csv',
     'player': '../levels/0/level_0_player.csv',
+    'tmx': '../levels/level_data/level_0.tmx',
+    'compiled': '../levels/0/level_0.bin',
     'floor': '../graphics/terrain/floor_0.png',
     'unlock': 1}
 
@@ -13,6 +15,8 @@ level_1 = {
     'flowers': '../levels/1/level_1_flowers.csv',
     'enemies': '../levels/1/level_1_enemies.csv',
     'player': '../levels/1/level_1_player.csv',
+    'tmx': '../levels/level_data/level_1.tmx',
+    'compiled': '../levels/1/level_1.bin',
     'floor': '../graphics/terrain/floor_1.png',
     'unlock': 2}
 
@@ -22,6 +26,8 @@ level_2 = {
     'flowers': '../levels/2/level_2_flowers.csv',
     'enemies': '../levels/2/level_2_enemies.csv',
     'player': '../levels/2/level_2_player.csv',
+    'tmx': '../levels/level_data/level_2.tmx',
+    'compiled': '../levels/2/level_2.bin',
     'floor': '../graphics/terrain/floor_2.png',
     'unlock': 2}
 
@@ -32,3 +38,15 @@ levels = {
 
 menu_dict = {'game_over': ['Continue'], 'win': ['Continue'],
              'paused': ['Resume'], 'start': ['Training Level', 'Level 1', 'Level 2', 'Exit']}
+
+# volume, simultaneous voices, retrigger cooldown in ms and channel priority (higher wins) of every sound
+sound_data = {
+    'button': {'path': '../audio/button.wav', 'volume': 0.4, 'voices': 1, 'cooldown': 100, 'priority': 3},
+    'game_over': {'path': '../audio/game_over.wav', 'volume': 0.4, 'voices': 1, 'cooldown': 0, 'priority': 3},
+    'win': {'path': '../audio/win.wav', 'volume': 0.4, 'voices': 1, 'cooldown': 0, 'priority': 3},
+    'souleater_attack': {'path': '../audio/souleater_attack.wav', 'volume': 0.4, 'voices': 2, 'cooldown': 100,
+                         'priority': 2},
+    'coin': {'path': '../audio/coin.mp3', 'volume': 1, 'voices': 3, 'cooldown': 50, 'priority': 2},
+    'flower': {'path': '../audio/flower.wav', 'volume': 0.2, 'voices': 2, 'cooldown': 50, 'priority': 2},
+    'souleater_walk': {'path': '../audio/souleater_walk.mp3', 'volume': 0.01, 'voices': 2, 'cooldown': 300,
+                       'priority': 0}}
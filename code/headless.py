@@ -0,0 +1,194 @@
+import os
+from argparse import ArgumentParser
+from json import load
+from time import perf_counter
+
+import pygame
+
+from controls import ScriptedInput, controls
+from level import Level
+from main import Game
+from replay import load_recording, seed_simulation, state_checksum
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import sim_clock
+
+
+def init_headless():
+    """
+    Initializes pygame with SDL's dummy video and audio drivers, so levels can run without window and sound device.
+    Has to be called before any level is created.
+
+    Returns
+    ----------
+    pygame.Surface : off-screen display surface
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pygame.init()
+    return pygame.display.get_surface() or pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+class HeadlessLevel:
+    """
+    A class to run a level at full CPU speed without display, sound device and frame cap. The player is controlled by
+    a scripted input instead of the keyboard. Rendering into the off-screen display surface is optional.
+
+    Parameters
+    ----------
+    level_index : int
+        index of the level in game_data.levels
+    script : list
+        input steps (ticks, keys), see ScriptedInput
+    loop : bool
+        if True the input script is repeated
+    render : bool
+        if True every tick is drawn to the off-screen surface
+
+    Attributes
+    ----------
+    surface : pygame.Surface
+        off-screen display surface
+    level : Level
+        the running level
+    render : bool
+        see Parameters
+    ticks : int
+        simulation ticks run so far
+    """
+
+    def __init__(self, level_index, script=(), loop=False, render=False):
+        self.surface = init_headless()
+        controls.source = ScriptedInput(script, loop)
+        self.level = Level(level_index, self.surface, self.ignore_menu)
+        self.render = render
+        self.ticks = 0
+
+    @staticmethod
+    def ignore_menu(current_level, new_max_level):
+        """
+        Replaces Game.create_menu(), there is no menu to return to.
+        """
+
+    @property
+    def result(self):
+        """
+        State of the run: 'win' if the player reached the goal, 'game_over' if the player died, otherwise 'running'.
+        """
+        player = self.level.player
+        if player.player_win:
+            return 'win'
+        if player.health <= 0:
+            return 'game_over'
+        return 'running'
+
+    def step(self):
+        """
+        Advances the level by one simulation tick and draws it if render is True.
+        """
+        self.level.update()
+        sim_clock.advance()
+        self.ticks += 1
+        if self.render:
+            self.level.draw()
+
+    def run(self, max_ticks):
+        """
+        Runs the level until the player wins, dies or max_ticks have passed.
+
+        Parameters
+        ----------
+        max_ticks : int
+            maximum amount of simulation ticks
+
+        Returns
+        ----------
+        dict : result, ticks, coins, health, seconds and ticks_per_second of the run
+        """
+        start = perf_counter()
+        while self.ticks < max_ticks and self.result == 'running':
+            self.step()
+        seconds = perf_counter() - start
+
+        return {'result': self.result if self.result != 'running' else 'timeout',
+                'ticks': self.ticks,
+                'coins': self.level.player.coins,
+                'health': self.level.player.health,
+                'seconds': seconds,
+                'ticks_per_second': self.ticks / seconds if seconds else 0.0}
+
+
+def replay_session(recording, render=False):
+    """
+    Replays a recorded session from the main menu at full CPU speed without display and frame cap and checks whether
+    it reproduces the recorded state. Recorded sessions serve as repeatable workloads and regression tests of the
+    simulation.
+
+    Parameters
+    ----------
+    recording : Recording
+        recorded session, see replay.py
+    render : bool
+        if True every tick is drawn to the off-screen surface
+
+    Returns
+    ----------
+    dict : reproduced, ticks, checksum, seconds and ticks_per_second of the replay
+    """
+    surface = init_headless()
+    seed_simulation(recording.seed)
+    controls.source = ScriptedInput(recording.script())
+    game = Game(surface)
+
+    start = perf_counter()
+    start_tick = sim_clock.ticks
+    try:
+        while sim_clock.ticks - start_tick < recording.ticks:
+            game.update()
+            sim_clock.advance()
+            if render:
+                game.draw(True)
+    except SystemExit:
+        # the recorded session ended with the exit button
+        pass
+    seconds = perf_counter() - start
+
+    ticks = sim_clock.ticks - start_tick
+    checksum = state_checksum(game.level, ticks)
+    return {'reproduced': checksum == recording.checksum,
+            'ticks': ticks,
+            'checksum': checksum,
+            'seconds': seconds,
+            'ticks_per_second': ticks / seconds if seconds else 0.0}
+
+
+def main():
+    """
+    Command line entry point: runs one level headless and prints the results.
+    """
+    parser = ArgumentParser(description='Run a Maze Light level without display and frame cap.')
+    parser.add_argument('--level', type=int, default=0, help='index of the level')
+    parser.add_argument('--ticks', type=int, default=3600, help='maximum amount of simulation ticks')
+    parser.add_argument('--script', help='json file with input steps [[ticks, ["up", "space"]], ...]')
+    parser.add_argument('--loop', action='store_true', help='repeat the input script')
+    parser.add_argument('--render', action='store_true', help='draw every tick to an off-screen surface')
+    parser.add_argument('--replay', help='replay a recorded session (see main.py --record) instead of a level')
+    args = parser.parse_args()
+
+    if args.replay:
+        stats = replay_session(load_recording(args.replay), args.render)
+        for key, value in stats.items():
+            print(f'{key}: {value}')
+        return
+
+    script = []
+    if args.script:
+        with open(args.script) as script_file:
+            script = load(script_file)
+
+    stats = HeadlessLevel(args.level, script, args.loop, args.render).run(args.ticks)
+    for key, value in stats.items():
+        print(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
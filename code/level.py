@@ -1,12 +1,27 @@
+from bisect import bisect
+
+import numpy as np
 import pygame
 
+from animation import animation_clock
+from assets import assets
+from audio import audio
+from controls import controls
 from game_data import levels
+from level_compiler import LAYERS, load_level
 from message import Message
 from particles import ParticleEffect
+from pathfinding import Navigation
 from player import Player
-from settings import TILE_SIZE
+from profiler import profiler
+from registry import SpriteRegistry
+from settings import CAMERA_CELL_SIZE, TILE_SIZE
+from simulation import sim_clock
 from souleater import Souleater
-from support import import_csv_layout, import_cut_graphics
+from spatial import GridGroup, WallGrid
+from static_layer import StaticLayer
+from streaming import ChunkStreamer
+from swarm import SouleaterSwarm
 from tiles import Tile, AnimatedTile
 from ui import UI
 
@@ -24,6 +39,8 @@ class Level:
         surface to display level
     create_menu : def
         method to create new menu
+    layouts : numpy.ndarray
+        layouts of the level loaded in advance (see preload.py), None to load them in create_map()
 
     Attributes
     ----------
@@ -39,30 +56,44 @@ class Level:
         index of level to be unlocked after winning the current level
     create_menu : def
         method to create and display menu-object
+    layouts : numpy.ndarray
+        see Parameters
     game_paused : bool
         True if game is paused
     game_over : bool
         True if player health equals 0
     win : bool
         True if player hitbox collides with goal-sprite
-    souleater : Souleater
-        instance of souleater-object (enemy)
+    souleaters : list
+        all souleater-objects (enemies) of the level
+    swarm : SouleaterSwarm
+        array state and batched perception of all souleaters
     player : Player
         instance of player-object
     visible_sprites : CameraGroup
         modified sprite.Group for display of tiles with player-movement-offset
-    obstacle_sprites : pygame.sprite.Group
-        group of sprites for collision detection
+    registry : SpriteRegistry
+        sprites by kind (silver, gold, flowers, goal, enemies, effects), tiles are animated by the animation clock
+    obstacle_sprites : GridGroup
+        grid indexed group of sprites for collision detection
+    walls : WallGrid
+        tile ids of the walls, used for collision, rendering, navigation and shadow casting
+    streamer : ChunkStreamer
+        creates the tiles of the chunks around the player and kills them when the player leaves
     create_map() : method call
         place sprites on display surface
     ui : UI
         user-interface-object gives access to user interface
     message : Message
         game interruption message
+    messages : dict
+        menu_type mapped to the message built for it, reused on every interruption
     menu : Menu
         to display main menu
+    paused_frame_drawn : bool
+        True if the paused level is on the display surface, so only the message has to be drawn again
     """
-    def __init__(self, current_level, surface, create_menu):
+    def __init__(self, current_level, surface, create_menu, layouts=None):
         # general setup
         self.max_level = 0
         self.display_surface = surface
@@ -70,6 +101,7 @@ class Level:
         self.level_data = levels[current_level]
         self.new_max_level = self.level_data['unlock']
         self.create_menu = create_menu
+        self.layouts = layouts
 
         # game status
         self.game_paused = False
@@ -77,83 +109,112 @@ class Level:
         self.win = False
 
         # sprite set up
-        self.souleater = None
+        animation_clock.reset()
+        self.souleaters = []
+        self.swarm = SouleaterSwarm()
         self.player = None
         self.visible_sprites = CameraGroup(self.level_data)
-        self.obstacle_sprites = pygame.sprite.Group()
+        self.registry = SpriteRegistry()
+        self.obstacle_sprites = GridGroup()
+        self.walls = None
+        self.streamer = None
         self.create_map()
 
         # user interface
-        self.ui = UI()
+        self.ui = UI(self.walls.solid)
         self.message = None
+        self.messages = {}
         self.menu = None
-
-        # sound
-        self.game_over_sound = pygame.mixer.Sound('../audio/game_over.wav')
-        self.game_over_sound.set_volume(0.4)
-        self.win_sound = pygame.mixer.Sound('../audio/win.wav')
-        self.win_sound.set_volume(0.4)
-        self.enemy_attack_sound = pygame.mixer.Sound('../audio/souleater_attack.wav')
-        self.enemy_attack_sound.set_volume(0.4)
-        self.button_sound = pygame.mixer.Sound('../audio/button.wav')
-        self.button_sound.set_volume(0.4)
+        self.paused_frame_drawn = False
 
     def create_map(self):
         """
-        Method to import csv layouts by calling method import_csv_layout() from support.py and creating map by
-        placing sprites and objects accordingly to the csv_layout. Loops through each entry in dict layouts and
-        creates map according to csv-entry-values.
-        """
-        layouts = {
-            'walls': import_csv_layout(self.level_data['walls']),
-            'player': import_csv_layout(self.level_data['player']),
-            'flowers': import_csv_layout(self.level_data['flowers']),
-            'coins': import_csv_layout(self.level_data['coins']),
-            'enemies': import_csv_layout(self.level_data['enemies'])
-        }
-
-        for style, layout in layouts.items():
-            # loop over each row in csv layout
-            for row_index, row in enumerate(layout):
-                # loop over each value in row
-                for col_index, col in enumerate(row):
-                    if col != '-1':
-                        # determine position on display surface
-                        x = col_index * TILE_SIZE
-                        y = row_index * TILE_SIZE
-
-                        # enemies
-                        if style == 'enemies':
-                            if col == '0':
-                                self.souleater = Souleater((x, y), [self.visible_sprites], self.obstacle_sprites,
-                                                           self.damage_player)
-
-                        if style == 'player':
-                            if col == '0':
-                                self.player = Player((x, y), [self.visible_sprites], self.obstacle_sprites)
-                            if col == '1':
-                                tile_surface = pygame.image.load('../graphics/player/ring.png').convert_alpha()
-                                Tile((x, y), [self.visible_sprites, self.obstacle_sprites], 'goal', tile_surface)
-
-                        if style == 'walls':
-                            terrain_tile_list = import_cut_graphics('../graphics/terrain/wall_tiles.png')
-                            tile_surface = terrain_tile_list[int(col)]  # read id
-                            Tile((x, y), [self.visible_sprites, self.obstacle_sprites], 'static', tile_surface)
-
-                        if style == 'flowers':
-                            tile_surface = pygame.image.load('../graphics/flowers/1.png').convert_alpha()
-                            AnimatedTile((x, y), [self.visible_sprites, self.obstacle_sprites], 'flower', tile_surface,
-                                         '../graphics/flowers')
-
-                        if style == 'coins':
-                            if col == '0':
-                                tile_surface = pygame.image.load('../graphics/coins/gold/0.png').convert_alpha()
-                                AnimatedTile((x, y), [self.visible_sprites, self.obstacle_sprites], 'gold',
-                                             tile_surface, '../graphics/coins/gold')
-                            else:
-                                tile_surface = pygame.image.load('../graphics/coins/silver/0.png').convert_alpha()
-                                AnimatedTile((x, y), [self.visible_sprites, self.obstacle_sprites], 'silver',
-                                             tile_surface, '../graphics/coins/silver')
+        Method to load the layouts of the compiled level file by calling load_level() from level_compiler.py (which
+        recompiles the csv layers if they changed), unless they were loaded in advance, and creating map by placing
+        sprites and objects accordingly to the layouts. Walls are kept in a WallGrid, player and souleaters are created
+        for the whole level, the item and goal tiles are streamed in chunks around the player by the ChunkStreamer,
+        which loads the first chunks here. Sets up the shared navigation of the souleaters over the grid of obstacles.
+        """
+        layouts = self.layouts if self.layouts is not None else load_level(self.level_data)
+        self.walls = WallGrid(layouts[LAYERS.index('walls')])
+
+        # flow fields of the souleaters lead around all obstacles except the player
+        blocked = self.walls.solid | (layouts[LAYERS.index('player')] == 1)
+        for style in ('flowers', 'coins'):
+            blocked |= layouts[LAYERS.index(style)] != -1
+        self.swarm.navigation = Navigation(blocked)
+
+        # player
+        row_index, col_index = np.argwhere(layouts[LAYERS.index('player')] == 0)[0].tolist()
+        self.player = Player((col_index * TILE_SIZE, row_index * TILE_SIZE),
+                             [self.visible_sprites], self.obstacle_sprites, self.walls, self.registry,
+                             self.collect_item)
+
+        # tiles around the player
+        self.streamer = ChunkStreamer(layouts, self.create_tile, ('player', 'flowers', 'coins'))
+        self.streamer.update(self.player.rect.center)
+
+        # enemies
+        for row_index, col_index in np.argwhere(layouts[LAYERS.index('enemies')] == 0).tolist():
+            self.souleaters.append(Souleater((col_index * TILE_SIZE, row_index * TILE_SIZE),
+                                             [self.visible_sprites, self.registry.enemies], self.obstacle_sprites,
+                                             self.walls, self.damage_player, self.swarm))
+
+        # build the collision index of all placed obstacles
+        self.obstacle_sprites.refresh()
+
+        # pre-render floor and walls
+        self.visible_sprites.bake_static(self.walls.ids)
+
+    def create_tile(self, style, col, pos):
+        """
+        Method to create the sprite of a non-empty cell of the streamed layouts, called by the streamer when the chunk
+        of the cell is loaded.
+
+        Parameters
+        ----------
+        style : str
+            layer of the cell, see LAYERS
+        col : int
+            value of the cell
+        pos : (x,y)
+            position of the cell in the level
+
+        Returns
+        ----------
+        Tile : created tile, None for the player
+        """
+        if style == 'player' and col == 1:
+            tile_surface = assets.image('../graphics/player/ring.png')
+            return Tile(pos, [self.visible_sprites, self.obstacle_sprites, self.registry.goal], 'goal', tile_surface)
+
+        if style == 'flowers':
+            tile_surface = assets.image('../graphics/flowers/1.png')
+            return AnimatedTile(pos, [self.visible_sprites, self.obstacle_sprites, self.registry.flowers], 'flower',
+                                tile_surface, '../graphics/flowers')
+
+        if style == 'coins':
+            if col == 0:
+                tile_surface = assets.image('../graphics/coins/gold/0.png')
+                return AnimatedTile(pos, [self.visible_sprites, self.obstacle_sprites, self.registry.gold], 'gold',
+                                    tile_surface, '../graphics/coins/gold')
+            tile_surface = assets.image('../graphics/coins/silver/0.png')
+            return AnimatedTile(pos, [self.visible_sprites, self.obstacle_sprites, self.registry.silver], 'silver',
+                                tile_surface, '../graphics/coins/silver')
+        return None
+
+    def collect_item(self, sprite):
+        """
+        Method called by the player object for every collected coin or flower. Opens the tile of the item for the
+        navigation of the souleaters and removes it from the streamed layouts.
+
+        Parameters
+        ----------
+        sprite : AnimatedTile
+            collected item
+        """
+        self.swarm.navigation.open_tile(sprite.rect.center)
+        self.streamer.remove(sprite)
 
     def damage_player(self, damage):
         """
@@ -162,11 +223,11 @@ class Level:
         hurt_time is set, so next attack has to wait for timer to finish.
         """
         if self.player.vulnerable:
-            pygame.mixer.find_channel(True).play(self.enemy_attack_sound)
+            audio.play('souleater_attack')
             self.player.health -= damage
             self.player.vulnerable = False
-            self.player.hurt_time = pygame.time.get_ticks()
-            ParticleEffect(self.player.rect.center, [self.visible_sprites])
+            self.player.hurt_time = sim_clock.ticks
+            ParticleEffect(self.player.rect.center, [self.visible_sprites, self.registry.effects])
 
     def check_paused(self):
         """
@@ -174,12 +235,28 @@ class Level:
         Provides access to player health attributes via global player-object. After attack player hurt_time is set, so
         next attack has to wait for timer to finish.
         """
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
         if keys[pygame.K_m]:
-            self.button_sound.play()
+            audio.play('button')
             self.game_paused = not self.game_paused
-            self.message = Message(self.display_surface, self.current_level, self.max_level, 'paused', self.pause_game,
-                                   self.set_game_over, self.set_win, self.player.coins)
+            self.show_message('paused')
+
+    def show_message(self, menu_type):
+        """
+        Method to show the message of menu_type. Each message is built on first use and kept for the level.
+
+        Parameters
+        ----------
+        menu_type : str
+            'paused', 'game_over' or 'win'
+        """
+        if menu_type in self.messages:
+            self.messages[menu_type].show(self.player.coins)
+        else:
+            self.messages[menu_type] = Message(self.display_surface, self.current_level, self.max_level, menu_type,
+                                               self.pause_game, self.set_game_over, self.set_win, self.player.coins)
+        self.message = self.messages[menu_type]
+        self.invalidate()
 
     def check_death(self):
         """
@@ -187,10 +264,9 @@ class Level:
         message is created
         """
         if self.player.health <= 0:
-            pygame.mixer.find_channel(True).play(self.game_over_sound)
+            audio.play('game_over')
             self.game_paused = True
-            self.message = Message(self.display_surface, self.current_level, self.max_level, 'game_over',
-                                   self.pause_game, self.set_game_over, self.set_win, self.player.coins)
+            self.show_message('game_over')
 
     def set_game_over(self):
         """
@@ -204,10 +280,9 @@ class Level:
         created.
         """
         if self.player.player_win:
-            pygame.mixer.find_channel(True).play(self.win_sound)
+            audio.play('win')
             self.game_paused = True
-            self.message = Message(self.display_surface, self.current_level, self.max_level, 'win', self.pause_game,
-                                   self.set_game_over, self.set_win, self.player.coins)
+            self.show_message('win')
 
     def set_win(self):
         """
@@ -221,34 +296,89 @@ class Level:
         """
         self.game_paused = not self.game_paused
 
-    def run(self):
+    def update(self):
         """
-        Run-method for level. Displays current position of each object and user interface. Checks for win state,
-        game_over state and paused state to display either message or return to main menu if game has ended. If not
-        updates all level elements and checks whether to run messages for win, game_over or paused.
+        Update-method for level, called once per simulation tick. Checks for win state, game_over state and paused
+        state to update either message or return to main menu if game has ended. If not updates all level elements and
+        checks whether to run messages for win, game_over or paused.
         """
-        self.visible_sprites.camera_draw(self.player)
-        self.ui.display(self.player)
-
         if self.win:
             self.menu = self.create_menu(self.current_level, self.new_max_level)
         if self.game_over:
             self.menu = self.create_menu(self.current_level, self.max_level)
         if self.game_paused:
-            self.message.run()
+            with profiler.span('message_update'):
+                self.message.update()
         else:
-            self.visible_sprites.update()
-            self.visible_sprites.enemy_update(self.player)
-            self.check_paused()
-            self.check_win()
-            self.check_death()
+            with profiler.span('streaming'):
+                self.streamer.update(self.player.rect.center)
+                self.swarm.suspend_outside(self.streamer.active_rect())
+            with profiler.span('sprite_update'):
+                self.update_sprites()
+            with profiler.span('enemy_update'):
+                self.swarm.update(self.player)
+            with profiler.span('state_checks'):
+                self.check_paused()
+                self.check_win()
+                self.check_death()
+
+    def update_sprites(self):
+        """
+        Method to advance the shared animations and update the player, the souleaters and the running effects by one
+        simulation tick. Tiles, coins and flowers have no update of their own.
+        """
+        animation_clock.advance()
+        self.player.update()
+        self.registry.enemies.update()
+        self.registry.effects.update()
+        audio.listener = self.player.rect.center
 
+    def invalidate(self):
+        """
+        Method to draw the whole level again with the next draw(), e.g. after another screen covered it.
+        """
+        self.paused_frame_drawn = False
+
+    def draw(self):
+        """
+        Draw-method for level. Displays current position of each object, user interface and the message, if the game
+        is paused. While the game is paused, the level does not change and is only drawn once below the message.
+
+        Returns
+        ----------
+        list : pygame.Rect of every changed area of the display surface, empty if nothing changed
+        """
+        if self.game_paused and self.paused_frame_drawn:
+            with profiler.span('message_draw'):
+                return self.message.draw()
+
+        self.display_surface.fill('black')
+        with profiler.span('camera_draw'):
+            self.visible_sprites.camera_draw(self.player)
+        with profiler.span('ui'):
+            self.ui.display(self.player)
+        if profiler.show_overlay:
+            profiler.counts = self.registry.counts()
+        if self.game_paused:
+            with profiler.span('message_draw'):
+                self.message.invalidate()
+                self.message.draw()
+        self.paused_frame_drawn = self.game_paused
+        return [self.display_surface.get_rect()]
+
+    def run(self):
+        """
+        Run-method for level. Displays the level and advances it by one simulation tick.
+        """
+        self.draw()
+        self.update()
 
-class CameraGroup(pygame.sprite.Group):
+
+class CameraGroup(GridGroup):
     """
-    A class derived from pygame.sprite.Group to display all sprites in the group with the offset from the current player
+    A class derived from GridGroup to display all sprites in the group with the offset from the current player
     movement to the display surface to provide a camera function, that moves along with the player, maintaining the
-    player in the center.
+    player in the center. Sprites are indexed by their rect, so only sprites on screen are sorted and drawn.
 
     Parameters
     ----------
@@ -265,29 +395,51 @@ class CameraGroup(pygame.sprite.Group):
         y position of center of screen
     offset : (x,y)
         offset vector from player.rect.center to center of screen
-    floor_surface : pygame.Image
-        floor image
-    floor_rect : pygame.Rect
-        floor rect
+    floor : str
+        path of the floor image or directory of floor chunk images
+    static_layer : StaticLayer
+        pre-rendered chunks of floor and static tiles, None until bake_static() is called
+    view_rect : pygame.Rect
+        part of the level currently visible on screen
+    draw_order : list
+        sprites drawn in the last frame, sorted by y-value
+    draw_keys : list
+        sort keys (centery, insertion number) of draw_order
     """
     def __init__(self, level_data):
         # general setup
-        super().__init__()
+        super().__init__(CAMERA_CELL_SIZE, 'rect')
         self.display_surface = pygame.display.get_surface()
         self.half_width = self.display_surface.get_size()[0] // 2
         self.half_height = self.display_surface.get_size()[1] // 2
         self.offset = pygame.math.Vector2()
 
         # floor
-        self.floor_surface = pygame.image.load(level_data['floor']).convert()
-        self.floor_rect = self.floor_surface.get_rect(topleft=(0, 0))
+        self.floor = level_data['floor']
+        self.static_layer = None
+
+        # draw pipeline
+        self.view_rect = self.display_surface.get_rect()
+        self.draw_order = []
+        self.draw_keys = []
+
+    def bake_static(self, walls):
+        """
+        Sets up the pre-rendered chunks of floor and walls, which are drawn first in camera_draw().
+
+        Parameters
+        ----------
+        walls : numpy.ndarray
+            (rows, cols) wall layout of the level
+        """
+        self.static_layer = StaticLayer(self.floor, walls)
 
     def camera_draw(self, player):
         """
         A class derived from pygame.sprite.Group to display all sprites in the group with the offset from the current
         player movement to the display surface to provide a camera function, that moves along with the player,
         maintaining the player in the center. Sprites a sorted by their y-value before display to make lower sprites
-        appear in front of higher sprites.
+        appear in front of higher sprites. Only sprites overlapping the screen are drawn, in a single blits()-call.
 
         Parameters
         ----------
@@ -298,21 +450,44 @@ class CameraGroup(pygame.sprite.Group):
         self.offset.x = player.rect.centerx - self.half_width
         self.offset.y = player.rect.centery - self.half_height
 
-        # drawing the floor
-        floor_offset_pos = self.floor_rect.topleft - self.offset
-        self.display_surface.blit(self.floor_surface, floor_offset_pos)
+        # drawing the floor and walls
+        if self.static_layer:
+            self.static_layer.draw(self.display_surface, self.offset)
+
+        # sort visible sprites by y-value before display:
+        self.view_rect.topleft = (self.offset.x, self.offset.y)
+        self.sort_visible(self.query(self.view_rect))
 
-        # sort sprites by y-value before display:
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
+        offset_x, offset_y = self.view_rect.topleft
+        self.display_surface.blits([(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                                    for sprite in self.draw_order], False)
 
-    def enemy_update(self, player):
+    def sort_visible(self, visible):
         """
-        Help-method to update the enemy sprites separately after all the visible sprites have been updated to make
-        enemies be able to react on player behaviour.
+        Updates draw_order to the visible sprites sorted by y-value. Sprites keeping their position since the last
+        frame stay in place, only moved or newly visible sprites are inserted again. Ties are broken by insertion
+        order, which yields the same order as a stable sort of all sprites by rect.centery.
+
+        Parameters
+        ----------
+        visible : list
+            sprites overlapping the screen
         """
-        enemy_sprites = [sprite for sprite in self.sprites() if
-                         hasattr(sprite, 'sprite_type') and sprite.sprite_type == 'souleater']
-        for sprite in enemy_sprites:
-            sprite.enemy_update(player)
+        visible = set(visible)
+        order = []
+        keys = []
+        for sprite, key in zip(self.draw_order, self.draw_keys):
+            if sprite in visible and sprite.rect.centery == key[0]:
+                order.append(sprite)
+                keys.append(key)
+                visible.discard(sprite)
+
+        # insert moved and newly visible sprites
+        for sprite in visible:
+            key = (sprite.rect.centery, self.order[sprite])
+            index = bisect(keys, key)
+            keys.insert(index, key)
+            order.insert(index, sprite)
+
+        self.draw_order = order
+        self.draw_keys = keys
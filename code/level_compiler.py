@@ -0,0 +1,130 @@
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from game_data import levels
+from support import import_csv_layout
+
+LAYERS = ('walls', 'player', 'flowers', 'coins', 'enemies')
+MAGIC = b'MZLV'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHH')  # magic, version, layer count, rows, cols
+CELL_TYPE = np.dtype('<i2')
+
+
+def compiled_path(level_data):
+    """
+    Returns the path of the compiled level file, stored next to the csv layers.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+
+    Returns
+    ----------
+    str : path of the compiled level
+    """
+    if 'compiled' in level_data:
+        return level_data['compiled']
+    return level_data['walls'].replace('_walls.csv', '.bin')
+
+
+def source_paths(level_data):
+    """
+    Returns the paths of all files the compiled level is built from: the csv layers and the tiled-editor map, if
+    known.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+
+    Returns
+    ----------
+    list : source paths
+    """
+    paths = [level_data[layer] for layer in LAYERS]
+    if 'tmx' in level_data:
+        paths.append(level_data['tmx'])
+    return paths
+
+
+def is_stale(level_data):
+    """
+    Checks whether the compiled level is missing or older than one of its sources.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+
+    Returns
+    ----------
+    bool : True if the level has to be compiled
+    """
+    path = compiled_path(level_data)
+    if not os.path.exists(path):
+        return True
+    compiled_time = os.path.getmtime(path)
+    return any(os.path.getmtime(source) > compiled_time for source in source_paths(level_data))
+
+
+def compile_level(level_data):
+    """
+    Parses all csv layers of a level and writes them as one binary file: a header followed by one little-endian int16
+    array per layer in the order of LAYERS, each rows x cols cells. The file is written to a temporary file of its own
+    and moved in place, so readers never see a partial file and concurrent compilations of the same level (preload
+    jobs, main thread) do not interfere.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+    """
+    layouts = np.array([import_csv_layout(level_data[layer]) for layer in LAYERS], dtype=CELL_TYPE)
+    if layouts.ndim != 3:
+        raise ValueError(f'layers of {level_data["walls"]} differ in size')
+    _, rows, cols = layouts.shape
+
+    path = compiled_path(level_data)
+    handle, temporary_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path) or '.')
+    with os.fdopen(handle, 'wb') as level_file:
+        level_file.write(HEADER.pack(MAGIC, VERSION, len(LAYERS), rows, cols))
+        level_file.write(layouts.tobytes())
+    os.replace(temporary_path, path)
+
+
+def load_level(level_data):
+    """
+    Returns all layers of a level, compiling it first if the compiled file is missing, outdated or of an older
+    format. The returned array is a view on the bytes read from the file.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+
+    Returns
+    ----------
+    numpy.ndarray : read-only int16 array of shape (len(LAYERS), rows, cols), -1 marks empty cells
+    """
+    if is_stale(level_data):
+        compile_level(level_data)
+
+    with open(compiled_path(level_data), 'rb') as level_file:
+        data = level_file.read()
+    magic, version, layer_count, rows, cols = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or layer_count != len(LAYERS):
+        compile_level(level_data)
+        return load_level(level_data)
+
+    return np.frombuffer(data, CELL_TYPE, layer_count * rows * cols, HEADER.size).reshape(layer_count, rows, cols)
+
+
+if __name__ == '__main__':
+    for index, data in levels.items():
+        compile_level(data)
+        print(f'compiled level {index}: {compiled_path(data)}')
@@ -1,18 +1,33 @@
 import sys
+from argparse import ArgumentParser
 
 import pygame
 
+from assets import assets
+from audio import audio
+from controls import ScriptedInput, controls
 from level import Level
 from menu import Menu
+from preload import LevelPreloader
+from profiler import profiler
+from replay import InputRecorder, load_recording, new_seed, seed_simulation, state_checksum
 from settings import *
+from simulation import sim_clock
 
 
 class Game:
     """
     A class to initialize the game 'Maze Light'. Provides methods to create the main menu and the levels.
 
+    Parameters
+    ----------
+    screen : pygame.Surface
+        display surface of the game
+
     Attributes
     ----------
+    screen : pygame.Surface
+        see Parameters
     level : Level
         instance currently running level
     max_level : int
@@ -21,18 +36,23 @@ class Game:
         instance of currently running main menu
     status : str
          allows to switch between level and menu
+    preloader : LevelPreloader
+        loads the level selected in the menu in the background
     """
 
-    def __init__(self):
+    def __init__(self, screen):
         # menu
+        self.screen = screen
         self.level = None
         self.max_level = 0
-        self.menu = Menu(0, self.max_level, screen, self.create_level, sys.exit)
+        self.preloader = LevelPreloader()
+        self.menu = Menu(0, self.max_level, self.screen, self.create_level, sys.exit, self.preloader.request)
         self.status = 'menu'
 
     def create_menu(self, current_level, new_max_level):
         """
-        A method to set up the main menu and run it. Displays all playable levels and exit option.
+        A method to show the main menu again and run it. Displays all playable levels and exit option. The menu is
+        built once in __init__() and reused.
 
         Parameters
         ----------
@@ -43,57 +63,149 @@ class Game:
         """
         if new_max_level > self.max_level:
             self.max_level = new_max_level
-        self.menu = Menu(current_level, self.max_level, screen, self.create_level, sys.exit)
-        self.menu.can_move = False
-        self.menu.selection_time = pygame.time.get_ticks()
+        self.menu.reopen(current_level, self.max_level)
         self.status = 'menu'
 
     def create_level(self, current_level):
         """
-        A method to set up the current level and run it.
+        A method to set up the current level and run it. Uses the layouts and decoded images of the level if it was
+        preloaded while the menu was shown.
 
         Parameters
         ----------
         current_level : int
             index of the level to run
         """
-        self.level = Level(current_level, screen, self.create_menu)
+        preloaded = self.preloader.take(current_level)
+        if preloaded:
+            assets.provide_decoded(preloaded.surfaces)
+        self.level = Level(current_level, self.screen, self.create_menu, preloaded.layouts if preloaded else None)
+        assets.drop_decoded()
         self.status = 'level'
 
-    def run_game(self):
+    def update(self):
         """
-        Method to start the game.
+        Method to advance the running menu or level by one simulation tick.
         """
         if self.status == 'menu':
-            self.menu.run()
+            with profiler.span('menu_update'):
+                self.menu.update()
         else:
-            self.level.run()
+            self.level.update()
+
+    def draw(self, redraw=False):
+        """
+        Method to display the running menu or level.
 
+        Parameters
+        ----------
+        redraw : bool
+            if True the whole screen is drawn again, even if nothing changed
 
-# pygame setup
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Maze Light')
-clock = pygame.time.Clock()
-game = Game()
+        Returns
+        ----------
+        list : pygame.Rect of every changed area of the screen, empty if nothing changed
+        """
+        if self.status == 'menu':
+            if redraw:
+                self.menu.invalidate()
+            with profiler.span('menu_draw'):
+                return self.menu.draw()
+        if redraw:
+            self.level.invalidate()
+        return self.level.draw()
 
 
-def run():
+def run(record=None, replay=None, uncapped=False):
     """
-    Method provides basic pygame set up und calls run_game() to initialize the game.
+    Method provides basic pygame set up und runs the game loop. The simulation advances in fixed steps of TICK_RATE
+    per second, independent of the frame rate: the time of each rendered frame is collected and consumed in whole
+    simulation ticks. If rendering falls behind by more than MAX_TICKS_PER_FRAME ticks, the backlog is dropped.
+    With DIRTY_RECT_UPDATES only the areas of the screen the menu or level changed are presented, frames without
+    changes (e.g. an idle menu) are not presented at all. The profiler overlay changes every frame, the screen is
+    drawn entirely while it is shown.
+
+    The input of the session can be recorded to a file when the game is closed, or a recorded session can be
+    replayed instead of the keyboard. A replay ends after the recorded ticks and reports whether it reproduced the
+    recorded state.
+
+    Parameters
+    ----------
+    record : str
+        path to write the recording of the session to, None to not record
+    replay : str
+        path of a recording to replay, None to play with the keyboard
+    uncapped : bool
+        if True one simulation tick is run per frame without frame cap, e.g. to replay as fast as possible
     """
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-        screen.fill('black')
-        game.run_game()
-
-        pygame.display.update()
-        clock.tick(60)
+    # pygame setup
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption('Maze Light')
+    clock = pygame.time.Clock()
+    audio.load_all()
+
+    # input source and seed of the session
+    recording = load_recording(replay) if replay else None
+    recorder = None
+    if recording:
+        seed_simulation(recording.seed)
+        controls.source = ScriptedInput(recording.script())
+    elif record:
+        recorder = InputRecorder(controls.source, new_seed())
+        seed_simulation(recorder.seed)
+        controls.source = recorder
+    game = Game(screen)
+
+    tick_duration = 1000 / TICK_RATE
+    accumulator = 0
+    overlay_shown = False
+    try:
+        while True:
+            # the window has to be drawn again after it was covered or the overlay was hidden
+            redraw = not DIRTY_RECT_UPDATES or overlay_shown
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    profiler.handle_key(event.key)
+                if event.type == pygame.WINDOWEXPOSED:
+                    redraw = True
+
+            # fixed timestep simulation
+            frame_time = clock.tick(0 if uncapped else FPS)
+            accumulator = tick_duration if uncapped else accumulator + frame_time
+            ticks = 0
+            while accumulator >= tick_duration and ticks < MAX_TICKS_PER_FRAME:
+                game.update()
+                sim_clock.advance()
+                accumulator -= tick_duration
+                ticks += 1
+                if recording and sim_clock.ticks == recording.ticks:
+                    reproduced = state_checksum(game.level, sim_clock.ticks) == recording.checksum
+                    print(f'replay of {recording.ticks} ticks: {"reproduced" if reproduced else "diverged"}')
+                    pygame.quit()
+                    sys.exit(0 if reproduced else 1)
+            if accumulator >= tick_duration:
+                accumulator %= tick_duration
+
+            dirty_rects = game.draw(redraw or profiler.show_overlay)
+            overlay_shown = profiler.show_overlay
+            profiler.display(screen)
+
+            if dirty_rects:
+                with profiler.span('display_update'):
+                    pygame.display.update(dirty_rects)
+    finally:
+        if recorder:
+            recorder.recording(state_checksum(game.level, recorder.ticks)).save(record)
 
 
 if __name__ == '__main__':
-    run()
+    parser = ArgumentParser(description='Play Maze Light.')
+    parser.add_argument('--record', help='write the input of the session to this file when the game is closed')
+    parser.add_argument('--replay', help='replay a recorded session instead of reading the keyboard')
+    parser.add_argument('--uncapped', action='store_true', help='one simulation tick per frame without frame cap')
+    args = parser.parse_args()
+    run(args.record, args.replay, args.uncapped)
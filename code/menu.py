@@ -1,7 +1,11 @@
 import pygame
 
+from assets import assets
+from audio import audio
+from controls import controls
 from game_data import menu_dict
 from settings import *
+from simulation import ms_to_ticks, sim_clock
 
 
 class Menu:
@@ -21,6 +25,8 @@ class Menu:
         creates new level
     game_exit : def
         method to exit game
+    preload_level : def
+        starts loading the level of the selected button in the background, None to disable preloading
 
     Attributes
     ----------
@@ -34,6 +40,8 @@ class Menu:
         see Parameters
     exit : def
         see Parameters
+    preload_level : def
+        see Parameters
     menu_type : str
         type of menu for button creation and dict search
     button_nr : int
@@ -67,11 +75,13 @@ class Menu:
     selection_index : int
         index of currently selected button
     selection_time : int
-        time button was selected
+        simulation tick button was selected
     can_move : bool
         if True selection can be changed
+    drawn_selection : int
+        selection index shown on the display surface, None if the whole menu has to be drawn again
     """
-    def __init__(self, start_level, max_level, surface, create_level, game_exit):
+    def __init__(self, start_level, max_level, surface, create_level, game_exit, preload_level=None):
 
         # general setup
         self.display_surface = surface
@@ -79,11 +89,11 @@ class Menu:
         self.current_level = start_level
         self.create_level = create_level
         self.exit = game_exit
+        self.preload_level = preload_level
 
         # menu creation
         self.menu_type = 'start'
         self.button_nr = 0
-        self.title_font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
         self.half_height = self.display_surface.get_size()[1] * 0.5
         self.half_width = self.display_surface.get_size()[0] * 0.5
         self.bg_image = None
@@ -91,8 +101,8 @@ class Menu:
         self.menu_bg = None
         self.title_surf = None
         self.title_rect = None
-        self.title_font = pygame.font.Font(UI_FONT, MENU_FONT_SIZE)
-        self.font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
+        self.title_font = assets.font(UI_FONT, MENU_FONT_SIZE)
+        self.font = assets.font(UI_FONT, UI_FONT_SIZE)
         self.button_list = []
         self.inactive_button_list = []
         self.build_menu()  # calls create_menu
@@ -101,35 +111,39 @@ class Menu:
         self.selection_index = 0
         self.selection_time = None
         self.can_move = True
-
-        # sound
-        self.button_sound = pygame.mixer.Sound('../audio/button.wav')
-        self.button_sound.set_volume(0.4)
+        self.drawn_selection = None
 
     def build_menu(self):
         """
         A method to build an entire menu screen. Provides background image, menu background, titles and button-objects
-        with text.
+        with text. Is called once, the menu is reused afterwards (see reopen()).
         """
         top = self.half_height // 2
         left = self.half_width // 2 + 15
 
         # background image
-        self.bg_image = pygame.image.load('../graphics/menu_bg.png').convert()
+        self.bg_image = assets.image('../graphics/menu_bg.png', alpha=False)
         self.bg_rect = self.bg_image.get_rect(topleft=(0, 0))
 
         # background menu
         self.menu_bg = pygame.Rect(left, top, self.half_width, self.half_height)
-        # buttons
-        # determine number of buttons
-        self.button_nr = len(menu_dict[self.menu_type])
-        # set left for buttons
-        left = left + (self.half_width * 0.5) - (self.half_width * 0.7 * 0.5)
 
         # title
         self.title_surf = self.title_font.render('Maze Light', False, TEXT_COLOR)
         self.title_rect = self.title_surf.get_rect(center=(self.half_width, top + 50))
-        top += 20
+
+        self.build_buttons()
+
+    def build_buttons(self):
+        """
+        A method to create the button-objects, which are unlocked up to max_level. Each button pre-renders its states.
+        """
+        top = self.half_height // 2 + 20
+        left = self.half_width // 2 + 15 + (self.half_width * 0.5) - (self.half_width * 0.7 * 0.5)
+        self.button_list = []
+
+        # determine number of buttons
+        self.button_nr = len(menu_dict[self.menu_type])
 
         # create buttons
         for button, index in enumerate(range(self.button_nr)):
@@ -143,65 +157,147 @@ class Menu:
             else:
                 button = Button(left, top, self.half_width * 0.7, 50, index, self.font, text, self.menu_type, True)
             self.button_list.append(button)
+        self.invalidate()
 
     def input(self):
         """
         A method to trigger actions in menu according to keyboard input. Buttons can be selected via selection index and
         movement timer and can be triggered to call connected trigger()-method.
         """
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
 
         if self.can_move:
             if keys[pygame.K_RIGHT] and self.selection_index < self.button_nr - 1:
                 self.selection_index += 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = sim_clock.ticks
             elif keys[pygame.K_LEFT] and self.selection_index >= 1:
                 self.selection_index -= 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = sim_clock.ticks
             elif keys[pygame.K_UP] and self.selection_index >= 1:
                 self.selection_index -= 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = sim_clock.ticks
             elif keys[pygame.K_DOWN] and self.selection_index < self.button_nr - 1:
                 self.selection_index += 1
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = sim_clock.ticks
 
             if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-                pygame.mixer.find_channel(True).play(self.button_sound)
+                audio.play('button')
                 self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+                self.selection_time = sim_clock.ticks
                 self.button_list[self.selection_index].trigger(self.create_level, self.exit)
 
+    def reopen(self, current_level, max_level):
+        """
+        Method to show the menu again after a level has ended. The buttons are only built again if the unlocked
+        levels changed. Input is locked for the selection cooldown, so the key which confirmed the message screen does
+        not trigger a button as well.
+
+        Parameters
+        ----------
+        current_level : int
+            index of the level which has ended
+        max_level : int
+            index of the maximum unlocked level
+        """
+        self.current_level = current_level
+        if max_level != self.max_level:
+            self.max_level = max_level
+            self.build_buttons()
+        self.selection_index = 0
+        self.can_move = False
+        self.selection_time = sim_clock.ticks
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Method to draw the whole menu again with the next draw(), e.g. after another screen covered it.
+        """
+        self.drawn_selection = None
+
     def selection_cooldown(self):
         """
         Method measures time since last selection and compares with cooldown time. If enough time has passed, selection
         can continue since can_move is set True.
         """
         if not self.can_move:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.selection_time >= 100:
+            current_time = sim_clock.ticks
+            if current_time - self.selection_time >= ms_to_ticks(100):
                 self.can_move = True
 
-    def run(self):
+    def preload_selection(self):
         """
-        Method to display entire menu on screen surface and check and update according to keyboard input.
+        Method to preload the level of the selected button while the menu waits for input.
+        """
+        button = self.button_list[self.selection_index]
+        if self.preload_level and button.active and menu_dict[self.menu_type][button.index] != 'Exit':
+            self.preload_level(button.index)
+
+    def update(self):
+        """
+        Method to check and update menu according to keyboard input, called once per simulation tick.
         """
         self.input()
         self.selection_cooldown()
+        self.preload_selection()
 
-        # display background
-        self.display_surface.blit(self.bg_image, self.bg_rect)
+    def draw(self):
+        """
+        Method to display the menu on screen surface. The whole menu is only drawn after invalidate(), afterwards only
+        the buttons whose selection changed are drawn again.
 
-        # display menu background
-        pygame.draw.rect(self.display_surface, UI_BACKGROUND_COLOR, self.menu_bg)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, self.menu_bg, 3)
-        self.display_surface.blit(self.title_surf, self.title_rect)
+        Returns
+        ----------
+        list : pygame.Rect of every changed area of the screen surface, empty if nothing changed
+        """
+        if self.drawn_selection is None:
+            self.display_surface.fill('black')
+
+            # display background
+            self.display_surface.blit(self.bg_image, self.bg_rect)
+
+            # display menu background
+            pygame.draw.rect(self.display_surface, UI_BACKGROUND_COLOR, self.menu_bg)
+            pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, self.menu_bg, 3)
+            self.display_surface.blit(self.title_surf, self.title_rect)
+
+            for button in self.button_list:
+                button.display(self.display_surface, self.selection_index)
+            self.drawn_selection = self.selection_index
+            return [self.display_surface.get_rect()]
+
+        return self.draw_selection(self.button_list)
+
+    def draw_selection(self, buttons):
+        """
+        Method to draw the buttons of the previous and the current selection again if the selection changed.
 
-        for index, button in enumerate(self.button_list):
-            button.display(self.display_surface, self.selection_index, button.text)
+        Parameters
+        ----------
+        buttons : list
+            buttons of the menu
+
+        Returns
+        ----------
+        list : pygame.Rect of every button drawn again
+        """
+        if self.drawn_selection == self.selection_index:
+            return []
+        changed = [button for button in buttons if button.index in (self.drawn_selection, self.selection_index)]
+        for button in changed:
+            button.display(self.display_surface, self.selection_index)
+        self.drawn_selection = self.selection_index
+        return [button.rect for button in changed]
+
+    def run(self):
+        """
+        Method to check and update according to keyboard input and display entire menu on screen surface.
+        """
+        self.update()
+        self.draw()
 
 
 class Button:
@@ -244,6 +340,8 @@ class Button:
         see Parameters
     active : bool
         see Parameters
+    images : dict
+        pre-rendered button surfaces of the states 'normal' and 'selected', or 'inactive' for inactive buttons
     """
     def __init__(self, left, top, width, height, index, font, text, menu_type, active):
         self.menu_type = menu_type
@@ -252,15 +350,38 @@ class Button:
         self.font = font
         self.text = text
         self.active = active
+        self.images = {}
+        self.render()
+
+    def render(self):
+        """
+        Method to pre-render the button in all states it can be displayed in.
+        """
+        self.images = {}
+        states = ('normal', 'selected') if self.active else ('inactive',)
+        for state in states:
+            image = pygame.Surface(self.rect.size)
+            bounds = image.get_rect()
+            if state == 'selected':
+                pygame.draw.rect(image, MENU_COLOR_SELECTED, bounds)
+                pygame.draw.rect(image, BORDER_COLOR_SELECTED, bounds, 3)
+            elif state == 'normal':
+                pygame.draw.rect(image, UI_BACKGROUND_COLOR, bounds)
+                pygame.draw.rect(image, UI_BORDER_COLOR, bounds, 3)
+            else:
+                pygame.draw.rect(image, MENU_COLOR_INACTIVE, bounds)
+                pygame.draw.rect(image, UI_BORDER_COLOR, bounds, 3)
+            self.display_text(image, self.text, state == 'selected')
+            self.images[state] = image
 
     def display_text(self, surface, text, selected):
         """
-        Method to display text on button.
+        Method to display text in the center of a button surface.
 
         Parameters
         ----------
-        surface : pygame.Display
-            surface to display text on
+        surface : pygame.Surface
+            button surface to display text on
         text : str
             text on button
         selected : bool
@@ -273,7 +394,7 @@ class Button:
 
         # text
         text_surf = self.font.render(text, False, color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
+        text_rect = text_surf.get_rect(center=surface.get_rect().center)
 
         # draw
         surface.blit(text_surf, text_rect)
@@ -298,10 +419,10 @@ class Button:
         elif selection == 'Exit':
             exit_game()
 
-    def display(self, surface, selection_num, text):
+    def display(self, surface, selection_num):
         """
         Method to display button in color of current state of selection. If active is False, button is non-clickable and
-        displayed in distinguished colors.
+        displayed in distinguished colors. Blits the pre-rendered image of the state.
 
         Parameters
         ----------
@@ -309,20 +430,11 @@ class Button:
             surface to display text on
         selection_num : int
             index of the currently selected button
-        text : str
-            displayed text
         """
-        if self.active:
-            if self.index == selection_num:
-                pygame.draw.rect(surface, MENU_COLOR_SELECTED, self.rect)
-                pygame.draw.rect(surface, BORDER_COLOR_SELECTED, self.rect, 3)
-            else:
-                pygame.draw.rect(surface, UI_BACKGROUND_COLOR, self.rect)
-                pygame.draw.rect(surface, UI_BORDER_COLOR, self.rect, 3)
-
-            self.display_text(surface, text, self.index == selection_num)
+        if not self.active:
+            state = 'inactive'
+        elif self.index == selection_num:
+            state = 'selected'
         else:
-            pygame.draw.rect(surface, MENU_COLOR_INACTIVE, self.rect)
-            pygame.draw.rect(surface, UI_BORDER_COLOR, self.rect, 3)
-
-            self.display_text(surface, text, self.index == selection_num)
+            state = 'normal'
+        surface.blit(self.images[state], self.rect)
@@ -2,8 +2,12 @@ import sys
 
 import pygame
 
+from audio import audio
+from controls import controls
 from menu import Button, Menu
 from settings import *
+from simulation import sim_clock
+from text import text_renderer
 
 
 class Message(Menu):
@@ -68,10 +72,6 @@ class Message(Menu):
         self.score_rect = None
         self.build_message()  # calls build message
 
-        # sound
-        self.button_sound = pygame.mixer.Sound('../audio/button.wav')
-        self.button_sound.set_volume(0.4)
-
     def build_message(self):
         """
         A method to build a message object, the appearance and content of the message is defined by the menu_type.
@@ -88,18 +88,12 @@ class Message(Menu):
         if self.menu_type == 'game_over':
             # title
             self.title_surf = self.title_font.render('Game Over', False, TEXT_COLOR)
-
-            # score
-            self.score_surf = self.font.render(f'Coins: {self.coins}', False, TEXT_COLOR)
-            self.score_rect = self.score_surf.get_rect(center=(self.menu_bg.center[0], top + 130))
+            self.build_score()
 
         elif self.menu_type == 'win':
             # title
             self.title_surf = self.title_font.render('Level Accomplished', False, TEXT_COLOR)
-
-            # score
-            self.score_surf = self.font.render(f'Coins: {self.coins}', False, TEXT_COLOR)
-            self.score_rect = self.score_surf.get_rect(center=(self.menu_bg.center[0], top + 130))
+            self.build_score()
 
         elif self.menu_type == 'paused':
             # title
@@ -108,6 +102,32 @@ class Message(Menu):
         self.title_rect = self.title_surf.get_rect(center=(self.menu_bg.center[0], top + 50))
         self.button = Button(left, top + 200, self.half_width * 0.7, 50, 0, self.font, 'Continue', self.menu_type, True)
 
+    def build_score(self):
+        """
+        A method to render the coins score of game over and win messages.
+        """
+        top = self.half_height // 2
+        self.score_surf = text_renderer.render(f'Coins: {self.coins}', UI_FONT_SIZE, TEXT_COLOR)
+        self.score_rect = self.score_surf.get_rect(center=(self.menu_bg.center[0], top + 130))
+
+    def show(self, coins):
+        """
+        A method to show the message again, it is kept by the level after it was built once. Only the score is
+        rendered again if the coins changed.
+
+        Parameters
+        ----------
+        coins : int
+            current amount of coins collected by the player
+        """
+        if coins != self.coins:
+            self.coins = coins
+            if self.score_surf:
+                self.build_score()
+        self.selection_index = 0
+        self.can_move = True
+        self.invalidate()
+
     def trigger(self):
         """
         Method to trigger continue button. Calls different methods according to game state.
@@ -128,28 +148,35 @@ class Message(Menu):
         """
         A method to fetch keyboard input and call the trigger()-method if continue-button is pressed.
         """
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
         if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-            pygame.mixer.find_channel(True).play(self.button_sound)
+            audio.play('button')
             self.can_move = False
-            self.selection_time = pygame.time.get_ticks()
+            self.selection_time = sim_clock.ticks
             self.trigger()
 
-    def run(self):
-        """
-        Method to display entire message on screen.
+    def draw(self):
         """
-        self.input()
-        self.selection_cooldown()
+        Method to display the message on screen. The whole message is only drawn after invalidate(), afterwards only
+        the continue-button if its selection changed.
 
-        # display background
-        pygame.draw.rect(self.display_surface, UI_BACKGROUND_COLOR, self.menu_bg)
-        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, self.menu_bg, 3)
-        self.display_surface.blit(self.title_surf, self.title_rect)
-
-        # display score
-        if self.score_surf:
-            self.display_surface.blit(self.score_surf, self.score_rect)
-
-        # display continue-button
-        self.button.display(self.display_surface, self.selection_index, self.button.text)
+        Returns
+        ----------
+        list : pygame.Rect of every changed area of the screen, empty if nothing changed
+        """
+        if self.drawn_selection is None:
+            # display background
+            pygame.draw.rect(self.display_surface, UI_BACKGROUND_COLOR, self.menu_bg)
+            pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, self.menu_bg, 3)
+            self.display_surface.blit(self.title_surf, self.title_rect)
+
+            # display score
+            if self.score_surf:
+                self.display_surface.blit(self.score_surf, self.score_rect)
+
+            # display continue-button
+            self.button.display(self.display_surface, self.selection_index)
+            self.drawn_selection = self.selection_index
+            return [self.menu_bg.copy()]
+
+        return self.draw_selection([self.button])
@@ -1,6 +1,6 @@
 import pygame
 
-from support import import_folder
+from assets import assets
 
 
 class ParticleEffect(pygame.sprite.Sprite):
@@ -13,7 +13,7 @@ class ParticleEffect(pygame.sprite.Sprite):
     frame_index : int
         index of the image to be displayed
     animation_speed : float
-        increment of the frame_index-value
+        increment of the frame_index-value per simulation tick
     animations : list
         images from folder to be displayed
     image : python.Surface
@@ -26,7 +26,7 @@ class ParticleEffect(pygame.sprite.Sprite):
         super().__init__(groups)
         self.frame_index = 0
         self.animation_speed = 0.15
-        self.animations = import_folder('../graphics/particles/')
+        self.animations = assets.folder('../graphics/particles/')
         self.image = self.animations[self.frame_index]
         self.rect = self.image.get_rect(center=pos)
 
@@ -0,0 +1,145 @@
+from collections import OrderedDict, deque
+
+from settings import FLOW_FIELD_CACHE_SIZE, FLOW_FIELD_RADIUS, TILE_SIZE
+
+
+class FlowField:
+    """
+    A class to find the way through the maze to one target tile. A breadth-first search from the target over the free
+    tiles of the obstacle grid stores for every reached tile the neighbour tile which is one step closer to the target.
+    Every souleater can then read its next step in O(1). The search stops radius steps away from the target, for
+    souleaters FLOW_FIELD_RADIUS, since they only chase a player they can see.
+
+    Parameters
+    ----------
+    blocked : numpy.ndarray
+        (rows, cols) bool array, True for tiles blocked by obstacles
+    target : (col, row)
+        target tile
+    radius : int
+        maximum number of steps to the target, None to search the whole grid
+
+    Attributes
+    ----------
+    target : (col, row)
+        see Parameters
+    radius : int
+        see Parameters
+    next_step : dict
+        (col, row) of a reached tile mapped to (col, row) of the next tile on the way to target
+    """
+
+    def __init__(self, blocked, target, radius=FLOW_FIELD_RADIUS):
+        self.target = target
+        self.radius = radius
+        self.next_step = {}
+        self.search(blocked)
+
+    def search(self, blocked):
+        """
+        Runs the breadth-first search from target over the 4-neighbourhood of free tiles.
+
+        Parameters
+        ----------
+        blocked : numpy.ndarray
+            (rows, cols) bool array, True for tiles blocked by obstacles
+        """
+        rows, cols = blocked.shape
+        col, row = self.target
+        if not (0 <= col < cols and 0 <= row < rows):
+            return
+
+        self.next_step[self.target] = self.target
+        queue = deque([(self.target, 0)])
+        while queue:
+            (col, row), steps = queue.popleft()
+            if self.radius is not None and steps >= self.radius:
+                continue
+            for neighbour in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+                n_col, n_row = neighbour
+                if 0 <= n_col < cols and 0 <= n_row < rows and neighbour not in self.next_step \
+                        and not blocked[n_row, n_col]:
+                    self.next_step[neighbour] = (col, row)
+                    queue.append((neighbour, steps + 1))
+
+
+class Navigation:
+    """
+    A class to provide flow fields for all souleaters of a level. Fields are computed once per target tile and shared
+    by all souleaters, the most recently used FLOW_FIELD_CACHE_SIZE fields are kept (e.g. for the current and the
+    remembered player position).
+
+    Parameters
+    ----------
+    blocked : numpy.ndarray
+        (rows, cols) bool array, True for tiles blocked by obstacles
+
+    Attributes
+    ----------
+    blocked : numpy.ndarray
+        see Parameters, tiles of collected items are set free
+    fields : OrderedDict
+        target tile mapped to its FlowField, ordered from least to most recently used
+    """
+
+    def __init__(self, blocked):
+        self.blocked = blocked
+        self.fields = OrderedDict()
+
+    def open_tile(self, position):
+        """
+        Marks the tile at position as free, e.g. after an item was collected, and drops all flow fields.
+
+        Parameters
+        ----------
+        position : (x,y)
+            position on the tile
+        """
+        col, row = int(position[0] // TILE_SIZE), int(position[1] // TILE_SIZE)
+        if self.blocked[row, col]:
+            self.blocked[row, col] = False
+            self.fields.clear()
+
+    def field(self, target):
+        """
+        Returns the flow field to a target tile, computes it if necessary.
+
+        Parameters
+        ----------
+        target : (col, row)
+            target tile
+
+        Returns
+        ----------
+        FlowField : field to target
+        """
+        if target in self.fields:
+            self.fields.move_to_end(target)
+        else:
+            self.fields[target] = FlowField(self.blocked, target)
+            if len(self.fields) > FLOW_FIELD_CACHE_SIZE:
+                self.fields.popitem(last=False)
+        return self.fields[target]
+
+    def waypoint(self, position, target_pos):
+        """
+        Returns the point to steer to from position on the way to target_pos: the center of the next tile of the
+        flow field, or target_pos itself if position is on the target tile or out of reach of the field.
+
+        Parameters
+        ----------
+        position : (x,y)
+            current position
+        target_pos : (x,y)
+            position to reach
+
+        Returns
+        ----------
+        (x,y) : point to steer to
+        """
+        target = (int(target_pos[0] // TILE_SIZE), int(target_pos[1] // TILE_SIZE))
+        tile = (int(position[0] // TILE_SIZE), int(position[1] // TILE_SIZE))
+        next_tile = self.field(target).next_step.get(tile)
+        if next_tile is None or tile == target:
+            return target_pos
+        return ((next_tile[0] + 0.5) * TILE_SIZE, (next_tile[1] + 0.5) * TILE_SIZE)
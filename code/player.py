@@ -1,7 +1,14 @@
 import pygame
 
+from assets import assets
+from audio import audio
+from controls import controls
 from entity import Entity
-from support import import_folder
+from simulation import ms_to_ticks, sim_clock
+
+# score of the coins
+SILVER_VALUE = 100
+GOLD_VALUE = 500
 
 
 class Player(Entity):
@@ -15,8 +22,14 @@ class Player(Entity):
         determines position of the player-sprite
     groups : list
         determines the sprite groups the player belongs to
-    obstacle_sprites : pygame.sprite.Group()
+    obstacle_sprites : spatial.GridGroup()
         group of sprites the player is able to collide with
+    walls : spatial.WallGrid
+        walls of the level
+    registry : SpriteRegistry
+        sprites of the level by kind, the player collects the pickups and reaches the goal
+    collect_item : def
+        function called with every collected coin or flower
 
     Attributes
     ----------
@@ -28,16 +41,20 @@ class Player(Entity):
         inflated Rect for environment interaction
     player_win : bool
         True if player-hit_box collides with goal-sprite
-    obstacle_sprites : sprite.Group()
+    obstacle_sprites : spatial.GridGroup()
         group of collide able environment-sprites
+    registry : SpriteRegistry
+        see Parameters
+    collect_item : def
+        see Parameters
     cooldown : int
-        value for input timer regulation
+        value for input timer regulation in simulation ticks
     light_on : bool
         light is on: player can see and is visible for enemies
     light_switch : bool
         player has switched light off/on
-    light_time : float
-        timer since last light switch
+    light_time : int
+        simulation tick of the last light switch
     animations : str
         path to folder with images for animation
     stats : dict
@@ -47,35 +64,37 @@ class Player(Entity):
     coins : int
         coins collected for score
     speed : int
-        speed of player movement
+        speed of player movement in pixel per simulation tick
     visible_factor : float
         factor by which visibility-radius of player is multiplied
     visible_radius : int
         radius in which player is able to see and to be seen by enemies
     vulnerable : bool
         if true enemy can attack player and cause damage
-    hurt_time : float
-        time of attack by enemy
+    hurt_time : int
+        simulation tick of attack by enemy
     invulnerability_duration : int
-        duration in which player is not able to be attacked
+        duration in simulation ticks in which player is not able to be attacked
     """
 
-    def __init__(self, pos, groups, obstacle_sprites):
+    def __init__(self, pos, groups, obstacle_sprites, walls, registry, collect_item):
         # general setup
-        super().__init__(groups, obstacle_sprites)
-        self.image = pygame.image.load('../graphics/player/move/0.png').convert_alpha()
+        super().__init__(groups, obstacle_sprites, walls)
+        self.image = assets.image('../graphics/player/move/0.png')
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(-15, -30)
         self.player_win = False
+        self.registry = registry
+        self.collect_item = collect_item
 
         # player movement
-        self.cooldown = 400
+        self.cooldown = ms_to_ticks(400)
         self.light_on = True
         self.light_switch = False
         self.light_time = None
 
         # animation
-        self.animations = import_folder('../graphics/player/move/')
+        self.animations = assets.folder('../graphics/player/move/')
 
         # statistics
         self.stats = {'health': 100, 'coins': 0, 'speed': 5, 'visible_factor': 1, 'visible_radius': 220}
@@ -88,13 +107,7 @@ class Player(Entity):
         # souleater interaction
         self.vulnerable = True
         self.hurt_time = None
-        self.invulnerability_duration = 400
-
-        # sounds
-        self.coin_sound = pygame.mixer.Sound('../audio/coin.mp3')
-        self.coin_sound.set_volume(1)
-        self.flower_sound = pygame.mixer.Sound('../audio/flower.wav')
-        self.flower_sound.set_volume(0.2)
+        self.invulnerability_duration = ms_to_ticks(400)
 
     def move(self, speed):
         """
@@ -123,41 +136,41 @@ class Player(Entity):
         """
         Determines movement of player by keyboard input via direction vector * speed. Therefore, direction vector
         has to be normalised. Checks for collisions in horizontal and vertical direction by calling sub-methods
-        item_collection() and collision().
+        item_collection() and collision(). Only the pickup groups and the goal of the sprite registry are tested, the
+        group of an item determines its effect.
         """
-        for sprite in self.obstacle_sprites:
-            if sprite.hitbox.colliderect(self.hitbox):
-                # silver coin collection
-                if sprite.sprite_type == 'silver':
-                    pygame.mixer.find_channel(True).play(self.coin_sound)
-                    self.coins += 100
-                    sprite.kill()
-                # gold coin collection
-                elif sprite.sprite_type == 'gold':
-                    pygame.mixer.find_channel(True).play(self.coin_sound)
-                    self.coins += 500
-                    sprite.kill()
-                # flower collection
-                elif sprite.sprite_type == 'flower':
-                    pygame.mixer.find_channel(True).play(self.flower_sound)
-                    self.visible_factor += 0.3
-                    self.speed += 1
-                    new_health = self.health + 25
-                    if new_health >= 100:
-                        self.health = 100
-                    else:
-                        self.health = new_health
-                    sprite.kill()
-                # win condition
-                elif sprite.sprite_type == 'goal':
-                    self.player_win = True
+        # flower collection
+        for flower in self.registry.flowers.colliding(self.hitbox):
+            audio.play('flower')
+            self.visible_factor += 0.3
+            self.speed += 1
+            new_health = self.health + 25
+            if new_health >= 100:
+                self.health = 100
+            else:
+                self.health = new_health
+            flower.kill()
+            self.collect_item(flower)
+
+        # silver and gold coin collection
+        for coins, value in ((self.registry.silver, SILVER_VALUE), (self.registry.gold, GOLD_VALUE)):
+            for coin in coins.colliding(self.hitbox):
+                audio.play('coin')
+                self.coins += value
+                coin.kill()
+                self.collect_item(coin)
+
+        # win condition
+        for goal in self.registry.goal:
+            if goal.hitbox.colliderect(self.hitbox):
+                self.player_win = True
 
     def input(self):
         """
-        Retrieves input from keyboard to move up, down, left right and activates light switch (including light
-        switch timer)via space-button.
+        Retrieves input from keyboard (or the current input source of controls) to move up, down, left right and
+        activates light switch (including light switch timer)via space-button.
         """
-        keys = pygame.key.get_pressed()
+        keys = controls.get_pressed()
 
         # movement input
         if keys[pygame.K_UP]:
@@ -177,7 +190,7 @@ class Player(Entity):
         # light input
         if keys[pygame.K_SPACE] and not self.light_switch:
             self.light_switch = True
-            self.light_time = pygame.time.get_ticks()
+            self.light_time = sim_clock.ticks
             if self.light_on:
                 self.light_on = False
             else:
@@ -188,7 +201,7 @@ class Player(Entity):
         Retrieves input from keyboard to move up, down, left right and activates light switch (including light
         switch timer)via space-button.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.ticks
         # light switch cooldown
         if self.light_switch:
             if current_time - self.light_time >= self.cooldown:
@@ -0,0 +1,164 @@
+import threading
+from collections import OrderedDict
+from os import walk
+from os.path import isdir, join, normpath
+
+import pygame
+
+from assets import assets
+from game_data import levels
+from level_compiler import load_level
+from settings import PRELOAD_BUDGET, PRELOAD_LEVEL_LIMIT
+
+# images and image-directories used by every level besides its floor
+LEVEL_ASSETS = ('../graphics/terrain/wall_tiles.png', '../graphics/terrain/visibility.png', '../graphics/player',
+                '../graphics/flowers', '../graphics/coins', '../graphics/souleater', '../graphics/particles')
+
+
+def level_image_paths(level_data):
+    """
+    Returns the paths of all image files a level loads. Images packed into the texture atlas are replaced by their
+    atlas page. A floor split into chunk images is left out, its chunks are only loaded while they are rendered.
+
+    Parameters
+    ----------
+    level_data : dict
+        entry of the level in game_data.levels
+
+    Returns
+    ----------
+    list : image paths, floor first
+    """
+    paths = [] if isdir(level_data['floor']) else [level_data['floor']]
+    for path in LEVEL_ASSETS:
+        if isdir(path):
+            for directory, _, image_files in walk(path):
+                paths += [join(directory, image) for image in image_files]
+        else:
+            paths.append(path)
+    return list(dict.fromkeys(assets.source_file(path) for path in paths))
+
+
+class PreloadJob:
+    """
+    A class to prepare a level in a background thread: the compiled layouts are loaded (compiling them if necessary)
+    and all images of the level which are not cached by the asset registry yet are decoded. Images are decoded only
+    until PRELOAD_BUDGET bytes are reached. Conversion of the images and creation of the sprites stay on the main
+    thread.
+
+    Parameters
+    ----------
+    level_index : int
+        key of the level in game_data.levels
+
+    Attributes
+    ----------
+    level_index : int
+        see Parameters
+    layouts : numpy.ndarray
+        layouts of the level, see load_level(), None until loaded
+    surfaces : dict
+        normalized path mapped to decoded image surface
+    size : int
+        bytes of the decoded images
+    cancelled : threading.Event
+        set to stop the job after the current file
+    lock : threading.Lock
+        guards surfaces and size, so no image is stored after the job was cancelled
+    thread : threading.Thread
+        worker thread running preload()
+    """
+
+    def __init__(self, level_index):
+        self.level_index = level_index
+        self.layouts = None
+        self.surfaces = {}
+        self.size = 0
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.preload, name=f'preload level {level_index}', daemon=True)
+        self.thread.start()
+
+    def preload(self):
+        """
+        Loads the layouts and decodes the images of the level, stops early if the job is cancelled.
+        """
+        level_data = levels[self.level_index]
+        self.layouts = load_level(level_data)
+
+        for path in level_image_paths(level_data):
+            if self.cancelled.is_set() or self.size >= PRELOAD_BUDGET:
+                return
+            if assets.contains_file(path):
+                continue
+            surface = pygame.image.load(path)
+            with self.lock:
+                if self.cancelled.is_set():
+                    return
+                self.surfaces[normpath(path)] = surface
+                self.size += assets.surface_size(surface)
+
+    def cancel(self):
+        """
+        Stops the job and releases the decoded images.
+        """
+        with self.lock:
+            self.cancelled.set()
+            self.surfaces = {}
+            self.size = 0
+
+
+class LevelPreloader:
+    """
+    A class to preload the level selected in the menu while the player decides. A new selection cancels the running
+    job of another level, finished jobs are kept for at most PRELOAD_LEVEL_LIMIT levels.
+
+    Attributes
+    ----------
+    jobs : OrderedDict
+        level index mapped to its PreloadJob, ordered from least to most recently requested
+    """
+
+    def __init__(self):
+        self.jobs = OrderedDict()
+
+    def request(self, level_index):
+        """
+        Starts preloading a level unless it is preloaded already. Called every tick while the level is selected.
+
+        Parameters
+        ----------
+        level_index : int
+            key of the level in game_data.levels
+        """
+        if level_index in self.jobs:
+            self.jobs.move_to_end(level_index)
+            return
+
+        # cancel jobs of other levels which are still running
+        for index, job in list(self.jobs.items()):
+            if job.thread.is_alive():
+                job.cancel()
+                del self.jobs[index]
+
+        self.jobs[level_index] = PreloadJob(level_index)
+        while len(self.jobs) > PRELOAD_LEVEL_LIMIT:
+            self.jobs.popitem(last=False)[1].cancel()
+
+    def take(self, level_index):
+        """
+        Removes the job of a level and waits until it is finished.
+
+        Parameters
+        ----------
+        level_index : int
+            key of the level in game_data.levels
+
+        Returns
+        ----------
+        PreloadJob : finished job, None if the level was not requested
+        """
+        job = self.jobs.pop(level_index, None)
+        if job:
+            job.thread.join()
+        return job
@@ -0,0 +1,249 @@
+import json
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+from assets import assets
+from audio import audio
+from settings import *
+from text import text_renderer
+
+
+class NullSpan:
+    """
+    A context manager doing nothing, returned by Profiler.span() while the profiler is disabled.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class Span:
+    """
+    A context manager measuring the duration of a phase and reporting it to the profiler.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        profiler to report to
+    name : str
+        name of the phase
+
+    Attributes
+    ----------
+    profiler : Profiler
+        see Parameters
+    name : str
+        see Parameters
+    start : float
+        perf_counter() at entering the span
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, self.start, perf_counter())
+        return False
+
+
+class Profiler:
+    """
+    A class to measure the duration of every phase of a frame (drawing, updates, menus, display update). Phases are
+    wrapped in span()-blocks. The last PROFILER_WINDOW durations of each phase are kept for an overlay with rolling
+    p50/p99 values and the audio voices in use, which is toggled with PROFILER_KEY. TRACE_KEY starts recording every
+    span as Chrome trace event and writes the trace to TRACE_PATH when pressed again (open it in chrome://tracing or
+    Perfetto). While neither overlay nor trace are active, span() returns a shared no-op context manager.
+
+    Attributes
+    ----------
+    enabled : bool
+        True if spans are measured
+    show_overlay : bool
+        True if the overlay is displayed
+    tracing : bool
+        True if trace events are recorded
+    samples : dict
+        phase name mapped to a deque of its last durations in seconds
+    phases : list
+        phase names in order of their first appearance
+    trace_events : list
+        recorded Chrome trace events
+    origin : float
+        perf_counter() the trace timestamps are relative to
+    null_span : NullSpan
+        shared span for the disabled profiler
+    font : pygame.font.Font
+        overlay font for the line height, fetched on first display
+    counts : dict
+        sprite counts by kind shown in the overlay, set by the running level
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.show_overlay = False
+        self.tracing = False
+        self.samples = {}
+        self.phases = []
+        self.trace_events = []
+        self.origin = perf_counter()
+        self.null_span = NullSpan()
+        self.font = None
+        self.counts = {}
+
+    def span(self, name):
+        """
+        Returns a context manager measuring the enclosed phase.
+
+        Parameters
+        ----------
+        name : str
+            name of the phase
+
+        Returns
+        ----------
+        Span or NullSpan : context manager
+        """
+        if not self.enabled:
+            return self.null_span
+        return Span(self, name)
+
+    def record(self, name, start, end):
+        """
+        Stores the duration of a finished span and adds a trace event if tracing.
+
+        Parameters
+        ----------
+        name : str
+            name of the phase
+        start : float
+            perf_counter() at the start of the span
+        end : float
+            perf_counter() at the end of the span
+        """
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=PROFILER_WINDOW)
+            self.phases.append(name)
+        self.samples[name].append(end - start)
+
+        if self.tracing and len(self.trace_events) < TRACE_MAX_EVENTS:
+            self.trace_events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                                      'ts': (start - self.origin) * 1e6, 'dur': (end - start) * 1e6})
+
+    def update_enabled(self):
+        """
+        Enables span measurement if overlay or trace are active.
+        """
+        self.enabled = self.show_overlay or self.tracing
+
+    def toggle_overlay(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.show_overlay = not self.show_overlay
+        self.update_enabled()
+
+    def start_trace(self):
+        """
+        Starts recording trace events.
+        """
+        self.trace_events = []
+        self.tracing = True
+        self.update_enabled()
+
+    def stop_trace(self, path=TRACE_PATH):
+        """
+        Stops recording and writes the trace events as Chrome trace json file.
+
+        Parameters
+        ----------
+        path : str
+            path of the trace file
+        """
+        self.tracing = False
+        self.update_enabled()
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def handle_key(self, key):
+        """
+        Reacts on the profiler hotkeys, called with the key of every KEYDOWN event.
+
+        Parameters
+        ----------
+        key : int
+            pygame key code
+        """
+        name = pygame.key.name(key)
+        if name == PROFILER_KEY:
+            self.toggle_overlay()
+        elif name == TRACE_KEY:
+            if self.tracing:
+                self.stop_trace()
+            else:
+                self.start_trace()
+
+    def percentiles(self, name):
+        """
+        Returns the rolling p50 and p99 of a phase in milliseconds.
+
+        Parameters
+        ----------
+        name : str
+            name of the phase
+
+        Returns
+        ----------
+        (float, float) : p50 and p99 in milliseconds
+        """
+        ordered = sorted(self.samples[name])
+        last = len(ordered) - 1
+        return ordered[last // 2] * 1000, ordered[int(last * 0.99)] * 1000
+
+    def display(self, surface):
+        """
+        Draws the overlay with p50/p99 of every phase in the top right corner, if it is shown.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            surface to draw on
+        """
+        if not self.show_overlay:
+            return
+        if not self.font:
+            self.font = assets.font(UI_FONT, PROFILER_FONT_SIZE)
+
+        lines = [f'{"phase":<16}{"p50":>7}{"p99":>7}']
+        lines += [f'{name:<16}{p50:>7.2f}{p99:>7.2f}' for name, (p50, p99) in
+                  ((name, self.percentiles(name)) for name in self.phases)]
+        audio_stats = audio.stats()
+        dropped = sum(count for name, count in audio_stats.items() if name.startswith('dropped'))
+        lines.append(f'voices: {audio_stats["voices"]}/{audio_stats["channels"]} dropped: {dropped}')
+        if self.counts:
+            lines.append(' '.join(f'{kind}: {count}' for kind, count in self.counts.items()))
+        if self.tracing:
+            lines.append(f'tracing: {len(self.trace_events)} events')
+
+        text_surfs = [text_renderer.render(line, PROFILER_FONT_SIZE, TEXT_COLOR) for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(text_surf.get_width() for text_surf in text_surfs) + 20
+        bg_rect = pygame.Rect(surface.get_width() - width - 10, 10, width, line_height * len(lines) + 20)
+        pygame.draw.rect(surface, UI_BACKGROUND_COLOR, bg_rect)
+        pygame.draw.rect(surface, UI_BORDER_COLOR, bg_rect, 3)
+        for index, text_surf in enumerate(text_surfs):
+            surface.blit(text_surf, (bg_rect.x + 10, bg_rect.y + 10 + index * line_height))
+
+
+# process-wide profiler
+profiler = Profiler()
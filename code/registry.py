@@ -0,0 +1,47 @@
+import pygame
+
+from spatial import GridGroup
+
+
+class SpriteRegistry:
+    """
+    A class to keep the sprites of a level indexed by kind, so every system only iterates the sprites it handles
+    instead of scanning all sprites and checking their sprite_type. Every kind is a sprite group: sprites are
+    registered by passing the group of their kind to their constructor and leave it when they are killed (collected,
+    unloaded by the streamer or finished), so the registry never has to be updated by hand. Walls are no sprites, they
+    are kept in the WallGrid of the level.
+
+    Attributes
+    ----------
+    silver : GridGroup
+        silver coins of the loaded chunks, indexed for the collision queries of the player
+    gold : GridGroup
+        gold coins of the loaded chunks, indexed for the collision queries of the player
+    flowers : GridGroup
+        flowers of the loaded chunks, indexed for the collision queries of the player
+    goal : pygame.sprite.Group
+        goal tile, empty while its chunk is not loaded
+    enemies : pygame.sprite.Group
+        souleaters
+    effects : pygame.sprite.Group
+        running particle effects
+    """
+
+    def __init__(self):
+        self.silver = GridGroup()
+        self.gold = GridGroup()
+        self.flowers = GridGroup()
+        self.goal = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.effects = pygame.sprite.Group()
+
+    def counts(self):
+        """
+        Returns the number of registered sprites of every kind for debugging and benchmarks.
+
+        Returns
+        ----------
+        dict : kind mapped to its number of sprites
+        """
+        return {'silver': len(self.silver), 'gold': len(self.gold), 'flowers': len(self.flowers),
+                'goal': len(self.goal), 'enemies': len(self.enemies), 'effects': len(self.effects)}
@@ -0,0 +1,241 @@
+import os
+import random
+import struct
+import zlib
+
+import numpy as np
+import pygame
+
+from controls import KeyState
+from simulation import sim_clock
+
+# keys read by Player.input(), Level.check_paused(), Menu.input() and Message.input(), recorded as bits of one byte
+RECORDED_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE, pygame.K_RETURN,
+                 pygame.K_m)
+MAGIC = b'MZRC'
+VERSION = 1
+HEADER = struct.Struct('<4sHIIII')  # magic, version, seed, ticks, checksum, run count
+RUN_TYPE = np.dtype([('ticks', '<u4'), ('mask', 'u1')])
+
+
+def seed_simulation(seed):
+    """
+    Seeds the random number generators of the simulation. Everything random in the game has to draw from random or
+    numpy.random, so a replay with the seed of the recording runs exactly like the recorded session.
+
+    Parameters
+    ----------
+    seed : int
+        seed of the session
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def new_seed():
+    """
+    Returns a random seed for a new session.
+
+    Returns
+    ----------
+    int : 32 bit seed
+    """
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def state_checksum(level, ticks):
+    """
+    Returns a checksum of the simulation state: player position, health, coins, light, the game state of the level and
+    the positions of all souleaters. A replay reproduces the recorded session if the checksums are equal.
+
+    Parameters
+    ----------
+    level : Level
+        current or last level of the session, None if no level was played
+    ticks : int
+        simulation ticks of the session
+
+    Returns
+    ----------
+    int : crc32 of the state
+    """
+    state = [ticks]
+    data = b''
+    if level:
+        player = level.player
+        state += [*player.hitbox, player.health, player.coins, player.visible_factor, player.light_on,
+                  level.game_paused, level.win, level.game_over]
+        data = level.swarm.positions.tobytes()
+    return zlib.crc32(np.asarray(state, dtype=np.float64).tobytes() + data)
+
+
+class Recording:
+    """
+    A class to keep the input of a recorded session: the key state of every simulation tick as bit mask of
+    RECORDED_KEYS, run-length encoded, the seed of the session and the checksum of the final state. Stored as binary
+    file: a header followed by (ticks, mask) of every run.
+
+    Parameters
+    ----------
+    seed : int
+        seed of the session
+    runs : list
+        (ticks, mask) of every run of ticks with the same keys
+    checksum : int
+        state_checksum() at the end of the session
+
+    Attributes
+    ----------
+    seed : int
+        see Parameters
+    runs : list
+        see Parameters
+    checksum : int
+        see Parameters
+    """
+
+    def __init__(self, seed, runs, checksum):
+        self.seed = seed
+        self.runs = runs
+        self.checksum = checksum
+
+    @property
+    def ticks(self):
+        """
+        Length of the session in simulation ticks.
+        """
+        return sum(ticks for ticks, _ in self.runs)
+
+    def script(self):
+        """
+        Returns the recorded input as script for a ScriptedInput.
+
+        Returns
+        ----------
+        list : steps (ticks, key codes)
+        """
+        return [(ticks, [key for bit, key in enumerate(RECORDED_KEYS) if mask & 1 << bit]) for ticks, mask in self.runs]
+
+    def save(self, path):
+        """
+        Writes the recording as binary file. The file is written to a temporary path and moved in place, so readers
+        never see a partial file.
+
+        Parameters
+        ----------
+        path : str
+            path of the recording
+        """
+        runs = np.array(self.runs, dtype=RUN_TYPE)
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as recording_file:
+            recording_file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.ticks, self.checksum, len(runs)))
+            recording_file.write(runs.tobytes())
+        os.replace(temporary_path, path)
+
+
+def load_recording(path):
+    """
+    Reads a recording written by Recording.save().
+
+    Parameters
+    ----------
+    path : str
+        path of the recording
+
+    Returns
+    ----------
+    Recording : loaded recording
+    """
+    with open(path, 'rb') as recording_file:
+        data = recording_file.read()
+    magic, version, seed, ticks, checksum, run_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is no recording of version {VERSION}')
+    runs = np.frombuffer(data, RUN_TYPE, run_count, HEADER.size)
+    return Recording(seed, [(int(run['ticks']), int(run['mask'])) for run in runs], checksum)
+
+
+class InputRecorder:
+    """
+    A class to record the key state of another input source once per simulation tick, used as input source of
+    controls. Only RECORDED_KEYS are passed on, so the recorded session sees exactly the input its replay will see.
+    Ticks without input request are recorded without pressed keys.
+
+    Parameters
+    ----------
+    source : KeyboardInput or ScriptedInput
+        input source to record
+    seed : int
+        seed of the session, the simulation has to be seeded with it (see seed_simulation())
+
+    Attributes
+    ----------
+    source : KeyboardInput or ScriptedInput
+        see Parameters
+    seed : int
+        see Parameters
+    start_tick : int
+        simulation tick the recording started at
+    masks : bytearray
+        key mask of every tick
+    state_tick : int
+        tick of state, None before the first request
+    state : KeyState
+        key state passed on in tick state_tick
+    """
+
+    def __init__(self, source, seed):
+        self.source = source
+        self.seed = seed
+        self.start_tick = sim_clock.ticks
+        self.masks = bytearray()
+        self.state_tick = None
+        self.state = None
+
+    @property
+    def ticks(self):
+        """
+        Simulation ticks since the start of the recording.
+        """
+        return sim_clock.ticks - self.start_tick
+
+    def get_pressed(self):
+        """
+        Returns the key state of the current simulation tick, reads and records it on the first request of the tick.
+
+        Returns
+        ----------
+        KeyState : pressed state of the recorded keys
+        """
+        tick = self.ticks
+        if tick != self.state_tick:
+            keys = self.source.get_pressed()
+            mask = sum(1 << bit for bit, key in enumerate(RECORDED_KEYS) if keys[key])
+            self.masks.extend(bytes(tick + 1 - len(self.masks)))
+            self.masks[tick] = mask
+            self.state_tick = tick
+            self.state = KeyState(key for bit, key in enumerate(RECORDED_KEYS) if mask & 1 << bit)
+        return self.state
+
+    def recording(self, checksum):
+        """
+        Returns the input recorded so far.
+
+        Parameters
+        ----------
+        checksum : int
+            state_checksum() of the current state
+
+        Returns
+        ----------
+        Recording : run-length encoded recording
+        """
+        masks = np.zeros(self.ticks, dtype=np.uint8)
+        recorded = np.frombuffer(bytes(self.masks[:self.ticks]), dtype=np.uint8)
+        masks[:len(recorded)] = recorded
+
+        # run-length encoding: a run starts at every change of the mask
+        starts = np.flatnonzero(np.diff(masks, prepend=np.int16(-1)))
+        lengths = np.diff(np.append(starts, len(masks)))
+        return Recording(self.seed, list(zip(lengths.tolist(), masks[starts].tolist())), checksum)
@@ -5,12 +5,22 @@ TILE_SIZE = 64
 SCREEN_HEIGHT = 720
 SCREEN_WIDTH = 1000
 SCREEN_CENTER = (500, 360)
+DIRTY_RECT_UPDATES = True  # present only the changed areas of the screen, False to update it every frame
+
+# timing
+TICK_RATE = 60  # simulation ticks per second
+FPS = 60  # frame rate cap for rendering, 0 for uncapped
+MAX_TICKS_PER_FRAME = 5  # simulation ticks caught up per rendered frame before the game slows down
 
 # ui
 BAR_HEIGHT = 20
 HEALTH_BAR_WIDTH = 200
 UI_FONT = '../font/ARCADEPI.TTF'
 UI_FONT_SIZE = 18
+DARKNESS_QUANTIZATION = 0.01  # step of the visible_factor for cached darkness masks
+DARKNESS_CACHE_SIZE = 8  # amount of cached darkness masks
+VISIBILITY_CACHE_SIZE = 64  # amount of cached shadow casting results
+TEXT_CACHE_SIZE = 64  # amount of cached text surfaces
 
 # menu
 MENU_FONT_SIZE = 35
@@ -19,8 +29,48 @@ MENU_COLOR_INACTIVE = (80, 80, 80)
 TEXT_COLOR_SELECTED = '#111111'
 BORDER_COLOR_SELECTED = '#111111'
 
+# souleaters
+FLOW_FIELD_RADIUS = 48  # steps in tiles searched from the target of a flow field
+FLOW_FIELD_CACHE_SIZE = 4  # amount of cached flow fields
+
+# profiler
+PROFILER_KEY = 'f3'  # toggles the frame timing overlay
+TRACE_KEY = 'f4'  # starts/stops recording a chrome trace
+TRACE_PATH = 'trace.json'
+TRACE_MAX_EVENTS = 1000000
+PROFILER_WINDOW = 240  # frames for the rolling percentiles
+PROFILER_FONT_SIZE = 12
+
 # colors
 TEXT_COLOR = '#EEEEEE'
 HEALTH_BAR_COLOR = (30, 130, 60)
 UI_BACKGROUND_COLOR = (54, 54, 54)
 UI_BORDER_COLOR = (135, 135, 135)
+
+# assets
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of pixel data kept by the asset registry
+ATLAS_INDEX = '../graphics/atlas/atlas.json'  # index of the texture atlas built by atlas.py
+ATLAS_PAGE_SIZE = 1024  # edge length in pixel of an atlas page
+
+# audio
+AUDIO_CHANNELS = 16  # mixer channels shared by all sounds
+AUDIO_HEARING_RADIUS = 800  # distance in pixel from the player at which positioned sounds become inaudible
+
+# preload
+PRELOAD_LEVEL_LIMIT = 2  # amount of levels kept preloaded
+PRELOAD_BUDGET = 32 * 1024 * 1024  # bytes of decoded images kept per preloaded level
+
+# animation
+TILE_ANIMATION_SPEED = 0.05  # frames per simulation tick of the coin and flower animations
+
+# camera
+CHUNK_SIZE = 1024  # edge length in pixel of the pre-rendered floor and wall chunks and of the streamed map chunks
+STATIC_CHUNK_LIMIT = 16  # amount of pre-rendered chunks kept in memory
+STREAM_RADIUS = 3  # chunks around the player with live tiles, souleaters move within STREAM_RADIUS - 1 chunks
+CAMERA_CELL_SIZE = 256  # grid cell size of the index used to find sprites on screen
+
+# bots
+BOT_MIN_HOLD = 10  # minimum ticks a random walking bot keeps its direction
+BOT_MAX_HOLD = 90  # maximum ticks a random walking bot keeps its direction
+BOT_LIGHT_CHANCE = 0.1  # chance of a random walking bot to switch the light when changing direction
+BATCH_TICKS = 7200  # default maximum simulation ticks of a batch run
@@ -0,0 +1,49 @@
+from settings import TICK_RATE
+
+
+def ms_to_ticks(milliseconds):
+    """
+    Converts a duration in milliseconds to simulation ticks.
+
+    Parameters
+    ----------
+    milliseconds : int
+        duration in milliseconds
+
+    Returns
+    ----------
+    int : duration in simulation ticks
+    """
+    return round(milliseconds * TICK_RATE / 1000)
+
+
+class SimClock:
+    """
+    A class to count simulation ticks. All gameplay timers (cooldowns, invulnerability, menu selection) are measured in
+    ticks of this clock instead of pygame.time.get_ticks(), so the game runs at the same speed regardless of the frame
+    rate. The clock is advanced once per fixed simulation step by the main loop.
+
+    Attributes
+    ----------
+    ticks : int
+        simulation ticks since start
+    """
+
+    def __init__(self):
+        self.ticks = 0
+
+    def advance(self):
+        """
+        Advances the clock by one simulation tick.
+        """
+        self.ticks += 1
+
+    def reset(self):
+        """
+        Sets the clock back to tick 0.
+        """
+        self.ticks = 0
+
+
+# process-wide simulation clock
+sim_clock = SimClock()
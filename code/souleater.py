@@ -1,4 +1,7 @@
+from assets import assets
+from audio import audio
 from entity import Entity
+from simulation import ms_to_ticks, sim_clock
 from support import *
 
 
@@ -13,10 +16,14 @@ class Souleater(Entity):
         determines position of the enemy-sprite
     groups : list
         determines the sprite groups the enemy-object belongs to
-    obstacle_sprites: pygame.sprite.Group()
+    obstacle_sprites: spatial.GridGroup()
         group of sprites the enemy is able to collide with
+    walls : spatial.WallGrid
+        walls of the level
     damage_player : def
         function which determines damage for player-object
+    swarm : SouleaterSwarm
+        swarm keeping positions and cooldowns of all souleaters of the level in arrays
 
     Attributes
     ----------
@@ -34,7 +41,7 @@ class Souleater(Entity):
         determines position of frames
     hitbox : pygame.Rect
         inflated Rect for environment interaction
-    obstacle_sprites : sprite.Group()
+    obstacle_sprites : spatial.GridGroup()
         group of collide able sprites
     stats : dict
         dictionary of enemy attributes
@@ -46,9 +53,9 @@ class Souleater(Entity):
     can_attack : boolean
         determines whether enemy is able to attack player
     attack_time : int
-        time of attack for timer
+        simulation tick of attack for timer
     attack_cooldown : int
-        time for cooldown after attack
+        simulation ticks for cooldown after attack
     damage_player : def
         function which determines damage for player-object
     last_player_pos : (x,y)
@@ -58,14 +65,18 @@ class Souleater(Entity):
     can_remember : boolean
          ability of enemy to remember new player position
     remember_time : int
-        time of remember player position
+        simulation tick of remember player position
     remember_cooldown : int
-        cooldown for remembering player position
+        cooldown in simulation ticks for remembering player position
+    swarm : SouleaterSwarm
+        see Parameters
+    swarm_index : int
+        index of the souleater in the arrays of swarm
     """
 
-    def __init__(self, pos, groups, obstacle_sprites, damage_player):
+    def __init__(self, pos, groups, obstacle_sprites, walls, damage_player, swarm):
         # general setup
-        super().__init__(groups, obstacle_sprites)
+        super().__init__(groups, obstacle_sprites, walls)
         self.sprite_type = 'souleater'
 
         # graphic setup
@@ -87,20 +98,52 @@ class Souleater(Entity):
         self.speed = self.stats['speed']
         self.attack_radius = self.stats['attack_radius']
 
-        # enemy-player interaction
-        self.can_attack = True
-        self.attack_time = None
-        self.attack_cooldown = 800
+        # enemy-player interaction, cooldowns are kept in the arrays of the swarm
+        self.swarm = swarm
+        self.swarm_index = swarm.add(self, self.attack_radius, ms_to_ticks(800), ms_to_ticks(800))
         self.damage_player = damage_player
         self.last_player_pos = None
         self.current_player_pos = None
-        self.can_remember = True
-        self.remember_time = None
-        self.remember_cooldown = 800
 
-        # sound
-        self.enemy_sound = pygame.mixer.Sound('../audio/souleater_walk.mp3')
-        self.enemy_sound.set_volume(0.01)
+    @property
+    def can_attack(self):
+        return bool(self.swarm.can_attack[self.swarm_index])
+
+    @can_attack.setter
+    def can_attack(self, value):
+        self.swarm.can_attack[self.swarm_index] = value
+
+    @property
+    def attack_time(self):
+        return int(self.swarm.attack_time[self.swarm_index])
+
+    @attack_time.setter
+    def attack_time(self, value):
+        self.swarm.attack_time[self.swarm_index] = value
+
+    @property
+    def attack_cooldown(self):
+        return int(self.swarm.attack_cooldown[self.swarm_index])
+
+    @property
+    def can_remember(self):
+        return bool(self.swarm.can_remember[self.swarm_index])
+
+    @can_remember.setter
+    def can_remember(self, value):
+        self.swarm.can_remember[self.swarm_index] = value
+
+    @property
+    def remember_time(self):
+        return int(self.swarm.remember_time[self.swarm_index])
+
+    @remember_time.setter
+    def remember_time(self, value):
+        self.swarm.remember_time[self.swarm_index] = value
+
+    @property
+    def remember_cooldown(self):
+        return int(self.swarm.remember_cooldown[self.swarm_index])
 
     def import_graphics(self):
         """
@@ -110,34 +153,9 @@ class Souleater(Entity):
 
         for animation in self.animations.keys():
             full_path = enemy_path + animation
-            self.animations[animation] = import_folder(full_path)
+            self.animations[animation] = assets.folder(full_path)
 
-    def get_player_distance_direction(self, player_pos):
-        """
-        Retrieves vector comprising distance and direction to player
-
-        Parameters
-        ----------
-        player_pos : (x,y)
-            assumed position of player object
-
-        Returns
-        -------
-        (float, float)
-            distance and direction of player-object
-        """
-        enemy_vec = pygame.math.Vector2(self.rect.center)
-        player_vec = pygame.math.Vector2(player_pos)
-        distance = (player_vec - enemy_vec).magnitude()
-        if distance > 0:
-
-            direction = (player_vec - enemy_vec).normalize()
-        else:
-            direction = pygame.math.Vector2(0, 0)
-
-        return (distance, direction)
-
-    def get_status(self, player):
+    def get_status(self, player, distance, direction):
         """
         Determines whether in visible radius of player, if yes, changing status to move status ('left' or 'right').When
         player is close enough for attack, changes to 'attack' status. If distance is larger than visible radius of
@@ -147,10 +165,11 @@ class Souleater(Entity):
         ----------
         player : Player
             player object
+        distance : float
+            distance to the player, computed by the swarm
+        direction : (x,y)
+            normalized direction to the player, computed by the swarm
         """
-        distance = self.get_player_distance_direction(self.current_player_pos)[0]
-        direction = self.get_player_distance_direction(self.current_player_pos)[1]
-
         if distance <= self.attack_radius and self.can_attack:
             if not 'attack' in self.status:
                 self.frame_index = 0
@@ -159,9 +178,9 @@ class Souleater(Entity):
                 else:
                     self.status = self.status + '_attack'
         elif distance <= player.visible_radius:
-            if direction.x > 0:  # right
+            if direction[0] > 0:  # right
                 self.status = 'right'
-            elif direction.x < 0:  # left
+            elif direction[0] < 0:  # left
                 self.status = 'left'
         else:
             if not 'idle' in self.status:
@@ -171,30 +190,34 @@ class Souleater(Entity):
                 else:
                     self.status = self.status + '_idle'
 
-    def actions(self, player):
+    def actions(self, player, direction):
         """
         Determines whether in visible radius of player, if yes, changing status to move status ('left' or 'right').When
         player is close enough for attack, changes to 'attack' status. If distance is larger than visible radius of
-        player: status is 'idle'
+        player: status is 'idle'. Moving souleaters follow the flow field of the swarm to the player or, while the
+        light is off, to the remembered player position.
 
         Parameters
         ----------
         player : Player
             player object
+        direction : (x,y)
+            normalized direction to the player, computed by the swarm
         """
         if 'attack' in self.status:
-            self.attack_time = pygame.time.get_ticks()
+            self.attack_time = sim_clock.ticks
             self.damage_player(self.attack_damage)
         elif self.status == 'left' or self.status == 'right':
-            pygame.mixer.find_channel(True).play(self.enemy_sound)
+            audio.play('souleater_walk', self.rect.center)
             if player.light_on:
-                self.direction = self.get_player_distance_direction(self.current_player_pos)[1]
+                self.direction = self.swarm.steer(self.swarm_index, player.rect.center)
             else:
                 if player.light_switch and self.can_remember:
                     self.last_player_pos = player.rect.center
-                    self.direction = self.get_player_distance_direction(self.last_player_pos)[1]
-                    self.remember_time = pygame.time.get_ticks()
+                    self.remember_time = sim_clock.ticks
                     self.can_remember = False
+                if self.last_player_pos:
+                    self.direction = self.swarm.steer(self.swarm_index, self.last_player_pos)
         else:
             self.direction = pygame.math.Vector2()
 
@@ -216,34 +239,32 @@ class Souleater(Entity):
         self.image = animation[int(self.frame_index)]
         self.rect = self.image.get_rect(center=self.hitbox.center)
 
-    def cooldown(self):
-        """
-        Cooldown timer for can_attack. After enemy attacked player, attack_time is saved. If passed time is greater than
-        cooldown time, can_attack is set back to True. Same functionality for can_remember to guarantee, last player
-        position is only remembered once, once light is turned off.
-        """
-        current_time = pygame.time.get_ticks()
-        if not self.can_attack:
-            if current_time - self.attack_time >= self.attack_cooldown:
-                self.can_attack = True
-        if not self.can_remember:
-            if current_time - self.remember_time >= self.remember_cooldown:
-                self.can_remember = True
-
     def update(self):
         """
-        Update method to run current movement, animation and cooldown for souleater-object. Calls move(), animate() and
-        cooldown().
+        Update method to run current movement and animation for souleater-object. Calls move() and animate() and
+        stores the new position in the swarm. Cooldowns of all souleaters are run by SouleaterSwarm.cooldown().
+        Souleaters suspended by the swarm (outside of the streamed area) keep their position.
         """
+        if self.swarm.suspended[self.swarm_index]:
+            return
         self.move(self.speed)
         self.animate()
-        self.cooldown()
+        self.swarm.positions[self.swarm_index] = self.rect.center
 
-    def enemy_update(self, player):
+    def enemy_update(self, player, distance, direction):
         """
-        Update method to get current player position, status and determine actions. Is called in class Level run()
-        method.
+        Update method to get current player position, status and determine actions. Is called by
+        SouleaterSwarm.update() with the distance and direction computed for all souleaters at once.
+
+        Parameters
+        ----------
+        player : Player
+            player object
+        distance : float
+            distance to the player
+        direction : (x,y)
+            normalized direction to the player
         """
         self.current_player_pos = player.rect.center
-        self.get_status(player)
-        self.actions(player)
+        self.get_status(player, distance, direction)
+        self.actions(player, direction)
@@ -0,0 +1,274 @@
+import numpy as np
+import pygame
+
+from settings import TILE_SIZE
+
+
+class GridGroup(pygame.sprite.Group):
+    """
+    A class derived from pygame.sprite.Group which additionally keeps an occupancy index of its sprites on a grid of
+    TILE_SIZE cells. Collision queries only look at the few cells a rect overlaps instead of every sprite in the group.
+    Sprites are indexed by the rect stored in the attribute box (hitbox by default). Since sprites join their groups
+    before their rects are set up, new sprites are indexed lazily on the next query. Killed sprites leave the index
+    immediately. Sprites with a True attribute moving (entities) are not put into cells, they are kept in a separate
+    set and tested directly on every query.
+
+    Parameters
+    ----------
+    cell_size : int
+        edge length of a grid cell in pixel
+    box : str
+        name of the sprite attribute holding the rect to index
+
+    Attributes
+    ----------
+    cell_size : int
+        see Parameters
+    box : str
+        see Parameters
+    cells : dict
+        (col, row) mapped to the set of sprites overlapping the cell
+    sprite_cells : dict
+        sprite mapped to the list of cells it was indexed in
+    order : dict
+        sprite mapped to its insertion number, queries return sprites in group order
+    pending : dict
+        sprites added to the group but not yet indexed, used as ordered set
+    movers : set
+        moving sprites, not indexed in cells
+    counter : int
+        next insertion number
+    """
+
+    def __init__(self, cell_size=TILE_SIZE, box='hitbox'):
+        self.cell_size = cell_size
+        self.box = box
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+        self.pending = {}
+        self.movers = set()
+        self.counter = 0
+        super().__init__()
+
+    def add_internal(self, sprite, layer=None):
+        """
+        Registers a sprite in the group and schedules it for indexing.
+        """
+        super().add_internal(sprite)
+        self.order[sprite] = self.counter
+        self.counter += 1
+        if getattr(sprite, 'moving', False):
+            self.movers.add(sprite)
+        else:
+            self.pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        """
+        Removes a sprite from the group and from the occupancy index.
+        """
+        super().remove_internal(sprite)
+        self.unindex(sprite)
+        del self.order[sprite]
+        self.movers.discard(sprite)
+        self.pending.pop(sprite, None)
+
+    def cell_range(self, rect):
+        """
+        Returns all cells overlapped by rect.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            rect in level coordinates
+
+        Returns
+        ----------
+        list : (col, row) of every overlapped cell
+        """
+        size = self.cell_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        return [(col, row) for row in range(top, bottom + 1) for col in range(left, right + 1)]
+
+    def index(self, sprite):
+        """
+        Inserts a sprite into every cell its rect overlaps.
+        """
+        cells = self.cell_range(getattr(sprite, self.box))
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(sprite)
+        self.sprite_cells[sprite] = cells
+
+    def unindex(self, sprite):
+        """
+        Removes a sprite from every cell it has been indexed in.
+        """
+        for cell in self.sprite_cells.pop(sprite, ()):
+            members = self.cells[cell]
+            members.discard(sprite)
+            if not members:
+                del self.cells[cell]
+
+    def refresh(self):
+        """
+        Indexes all sprites added since the last query. Called by Level after the map has been created, so the index
+        is built at load time.
+        """
+        for sprite in self.pending:
+            self.index(sprite)
+        self.pending.clear()
+
+    def query(self, rect):
+        """
+        Returns all sprites indexed in the cells overlapped by rect, in the order they were added to the group. The
+        indexed sprites are not tested for an actual overlap with rect, moving sprites are.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            rect in level coordinates
+
+        Returns
+        ----------
+        list : candidate sprites
+        """
+        if self.pending:
+            self.refresh()
+        found = set()
+        for cell in self.cell_range(rect):
+            members = self.cells.get(cell)
+            if members:
+                found.update(members)
+        for sprite in self.movers:
+            if getattr(sprite, self.box).colliderect(rect):
+                found.add(sprite)
+        return sorted(found, key=self.order.__getitem__)
+
+    def colliding(self, rect):
+        """
+        Yields every sprite whose indexed rect collides with rect, in group order. rect may be moved by the caller
+        between two sprites (like Entity.collision() does), every following sprite is tested against the moved rect.
+        Results are therefore identical to testing every sprite of the group in a loop.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            rect in level coordinates, may be changed while iterating
+
+        Yields
+        ----------
+        pygame.sprite.Sprite : colliding sprite
+        """
+        last = -1
+        while True:
+            position = tuple(rect)
+            for sprite in self.query(rect):
+                if self.order.get(sprite, -1) <= last:
+                    continue
+                if getattr(sprite, self.box).colliderect(rect):
+                    last = self.order.get(sprite, last)
+                    yield sprite
+                    if tuple(rect) != position:
+                        break
+            else:
+                return
+
+
+class WallGrid:
+    """
+    A class to keep the walls of a level as a compact grid of tile ids instead of one sprite per wall, a wall takes
+    three bytes (id and solid flag) instead of a sprite with its rects and group memberships. Collision, rendering
+    (StaticLayer), navigation and shadow casting all read the grid. Hitboxes are derived on demand and match the
+    hitbox of a wall Tile: the tile inflated by (0, -10).
+
+    Parameters
+    ----------
+    ids : numpy.ndarray
+        (rows, cols) wall layout of the level, ids of wall_tiles.png, -1 for empty cells
+
+    Attributes
+    ----------
+    ids : numpy.ndarray
+        (rows, cols) int16 copy of the wall layout
+    solid : numpy.ndarray
+        (rows, cols) bool array, True for wall tiles
+    rows : int
+        number of tile rows
+    cols : int
+        number of tile columns
+    """
+
+    def __init__(self, ids):
+        self.ids = ids.astype(np.int16)
+        self.solid = self.ids != -1
+        self.rows, self.cols = self.ids.shape
+
+    def hitbox(self, row, col):
+        """
+        Returns the hitbox of a wall tile.
+
+        Parameters
+        ----------
+        row : int
+            tile row
+        col : int
+            tile column
+
+        Returns
+        ----------
+        pygame.Rect : hitbox in level coordinates
+        """
+        return pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE).inflate(0, -10)
+
+    def query(self, rect):
+        """
+        Returns the walls in the tiles overlapped by rect, row by row. The walls are not tested for an actual overlap
+        with their hitboxes.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            rect in level coordinates
+
+        Returns
+        ----------
+        list : (row, col) of every wall
+        """
+        left = max(rect.left // TILE_SIZE, 0)
+        right = min((rect.right - 1) // TILE_SIZE, self.cols - 1)
+        top = max(rect.top // TILE_SIZE, 0)
+        bottom = min((rect.bottom - 1) // TILE_SIZE, self.rows - 1)
+        return [(row, col) for row in range(top, bottom + 1) for col in range(left, right + 1)
+                if self.solid[row, col]]
+
+    def colliding(self, rect):
+        """
+        Yields the hitbox of every wall colliding with rect, row by row. Like GridGroup.colliding(), rect may be moved
+        by the caller between two walls, every following wall is tested against the moved rect.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            rect in level coordinates, may be changed while iterating
+
+        Yields
+        ----------
+        pygame.Rect : hitbox of the colliding wall
+        """
+        last = (-1, -1)
+        while True:
+            position = tuple(rect)
+            for cell in self.query(rect):
+                if cell <= last:
+                    continue
+                hitbox = self.hitbox(*cell)
+                if hitbox.colliderect(rect):
+                    last = cell
+                    yield hitbox
+                    if tuple(rect) != position:
+                        break
+            else:
+                return
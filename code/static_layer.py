@@ -0,0 +1,206 @@
+import os
+from argparse import ArgumentParser
+from collections import OrderedDict
+from os.path import exists, isdir, join
+
+import numpy as np
+import pygame
+
+from assets import assets
+from settings import CHUNK_SIZE, STATIC_CHUNK_LIMIT, TILE_SIZE
+
+
+class StaticLayer:
+    """
+    A class to pre-render everything that never changes after Level.create_map() - the floor image and the wall
+    tiles - into chunk surfaces of CHUNK_SIZE pixels. The camera then blits only the chunks overlapping the screen
+    instead of the floor and every single wall tile. Chunks are rendered when they first become visible and at most
+    STATIC_CHUNK_LIMIT of them are kept, least recently drawn chunks are dropped and rendered again when needed. The
+    walls are read from the layout of the level, so no sprites are needed for them. The floor is either one image
+    or, for large maps, a directory with one image per chunk (see split_floor()), which are only loaded while their
+    chunk is rendered.
+
+    Parameters
+    ----------
+    floor : str
+        path of the floor image, placed at (0, 0), or of a directory with the floor images of the chunks
+    walls : numpy.ndarray
+        (rows, cols) wall layout of the level, ids of wall_tiles.png, -1 for empty cells
+
+    Attributes
+    ----------
+    chunk_size : int
+        edge length of a chunk in pixel
+    width : int
+        width of the baked layer in pixel
+    height : int
+        height of the baked layer in pixel
+    floor_surface : pygame.Surface
+        floor image of the level, None if the floor is split into chunk images
+    floor_directory : str
+        directory of the floor chunk images, None if the floor is one image
+    walls : numpy.ndarray
+        see Parameters
+    wall_images : list
+        image of every wall tile id
+    chunks : OrderedDict
+        (col, row) mapped to the pre-rendered chunk surface, ordered from least to most recently drawn
+    """
+
+    def __init__(self, floor, walls):
+        self.chunk_size = CHUNK_SIZE
+        if isdir(floor):
+            self.floor_surface = None
+            self.floor_directory = floor
+            floor_width = floor_height = 0
+        else:
+            self.floor_surface = assets.image(floor, alpha=False)
+            self.floor_directory = None
+            floor_width, floor_height = self.floor_surface.get_size()
+
+        # layer extent: floor plus the wall layout
+        self.width = max(floor_width, walls.shape[1] * TILE_SIZE)
+        self.height = max(floor_height, walls.shape[0] * TILE_SIZE)
+        self.walls = walls
+        self.wall_images = assets.cut_graphics('../graphics/terrain/wall_tiles.png')
+        self.chunks = OrderedDict()
+
+    def floor_chunk(self, col, row):
+        """
+        Returns the floor image of a chunk from the floor directory.
+
+        Parameters
+        ----------
+        col : int
+            column of the chunk
+        row : int
+            row of the chunk
+
+        Returns
+        ----------
+        pygame.Surface : floor of the chunk, None if the chunk has no floor image
+        """
+        path = join(self.floor_directory, f'{col}_{row}.png')
+        if not exists(path):
+            return None
+        return pygame.image.load(path).convert()
+
+    def bake(self, col, row):
+        """
+        Renders floor and wall tiles of one chunk into a new chunk surface. Walls are drawn row by row, including the
+        tiles next to the chunk, whose images may reach into it.
+
+        Parameters
+        ----------
+        col : int
+            column of the chunk
+        row : int
+            row of the chunk
+
+        Returns
+        ----------
+        pygame.Surface : rendered chunk
+        """
+        size = self.chunk_size
+        chunk = pygame.Surface((size, size)).convert()
+        chunk.fill('black')
+        if self.floor_surface:
+            chunk.blit(self.floor_surface, (-col * size, -row * size))
+        else:
+            floor = self.floor_chunk(col, row)
+            if floor:
+                chunk.blit(floor, (0, 0))
+
+        # wall tiles overlapping the chunk
+        tiles = size // TILE_SIZE
+        top = max(row * tiles - 1, 0)
+        left = max(col * tiles - 1, 0)
+        window = self.walls[top:(row + 1) * tiles + 1, left:(col + 1) * tiles + 1]
+        blits = []
+        for tile_row, tile_col in (np.argwhere(window != -1) + (top, left)).tolist():
+            image = self.wall_images[int(self.walls[tile_row, tile_col])]
+            rect = image.get_rect(center=((tile_col + 0.5) * TILE_SIZE, (tile_row + 0.5) * TILE_SIZE))
+            blits.append((image, (rect.x - col * size, rect.y - row * size)))
+        chunk.blits(blits, False)
+        return chunk
+
+    def get_chunk(self, col, row):
+        """
+        Returns the rendered chunk at (col, row), renders it if necessary and drops the least recently drawn chunk
+        if more than STATIC_CHUNK_LIMIT chunks are kept.
+
+        Parameters
+        ----------
+        col : int
+            column of the chunk
+        row : int
+            row of the chunk
+
+        Returns
+        ----------
+        pygame.Surface : rendered chunk
+        """
+        key = (col, row)
+        if key in self.chunks:
+            self.chunks.move_to_end(key)
+        else:
+            self.chunks[key] = self.bake(col, row)
+            if len(self.chunks) > STATIC_CHUNK_LIMIT:
+                self.chunks.popitem(last=False)
+        return self.chunks[key]
+
+    def draw(self, surface, offset):
+        """
+        Blits all chunks overlapping the screen with the camera offset.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            surface to draw on
+        offset : pygame.math.Vector2
+            camera offset, level position of the top left screen corner
+        """
+        size = self.chunk_size
+        view = pygame.Rect(int(offset.x), int(offset.y), *surface.get_size())
+        last_row = min((view.bottom - 1) // size, (self.height - 1) // size)
+        last_col = min((view.right - 1) // size, (self.width - 1) // size)
+        for row in range(max(view.top // size, 0), last_row + 1):
+            for col in range(max(view.left // size, 0), last_col + 1):
+                surface.blit(self.get_chunk(col, row), (col * size - view.x, row * size - view.y))
+
+
+def split_floor(path, directory):
+    """
+    Cuts a floor image into one image per chunk of CHUNK_SIZE pixels, named col_row.png, so the StaticLayer of a
+    large map only loads the floor of the chunks it renders. Use the directory as 'floor' of the level in
+    game_data.levels.
+
+    Parameters
+    ----------
+    path : str
+        path of the floor image
+    directory : str
+        directory for the chunk images, is created if necessary
+
+    Returns
+    ----------
+    int : number of written chunk images
+    """
+    floor = pygame.image.load(path)
+    size = CHUNK_SIZE
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for row in range((floor.get_height() - 1) // size + 1):
+        for col in range((floor.get_width() - 1) // size + 1):
+            area = pygame.Rect(col * size, row * size, size, size).clip(floor.get_rect())
+            pygame.image.save(floor.subsurface(area), join(directory, f'{col}_{row}.png'))
+            count += 1
+    return count
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Split a floor image into the chunk images of the static layer.')
+    parser.add_argument('floor', help='path of the floor image')
+    parser.add_argument('directory', help='directory for the chunk images')
+    args = parser.parse_args()
+    print(f'wrote {split_floor(args.floor, args.directory)} chunk images to {args.directory}')
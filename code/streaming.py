@@ -0,0 +1,199 @@
+import numpy as np
+import pygame
+
+from level_compiler import LAYERS
+from settings import CHUNK_SIZE, STREAM_RADIUS, TILE_SIZE
+
+
+class ChunkStreamer:
+    """
+    A class to stream the tiles of a level in chunks of CHUNK_SIZE pixels, the same grid the StaticLayer renders. The
+    layouts of the whole level are kept as compact arrays, sprites of items and the goal only exist for the chunks
+    within STREAM_RADIUS chunks of the player (walls never become sprites, see WallGrid). Their sprites are killed once
+    the player is more than STREAM_RADIUS + 1 chunks away (one chunk of hysteresis, so walking along a chunk border
+    does not load and unload the same chunks every tick), which keeps the number of live sprites independent of the
+    map size. Collected items are removed from the layouts and are not created again. Moving souleaters are only
+    updated inside the active area - the chunks within STREAM_RADIUS - 1 chunks of the player - where all surrounding
+    obstacles exist.
+
+    Parameters
+    ----------
+    layouts : numpy.ndarray
+        layouts of the level, see load_level()
+    create_tile : def
+        creates the sprite of a non-empty cell, called with (style, cell value, (x, y)), returns None for cells which
+        are no tiles (player)
+    styles : tuple
+        layers of LAYERS streamed as sprites
+
+    Attributes
+    ----------
+    layouts : numpy.ndarray
+        writable copy of the layouts, collected items are set to -1
+    create_tile : def
+        see Parameters
+    styles : tuple
+        see Parameters
+    chunk_tiles : int
+        edge length of a chunk in tiles
+    rows : int
+        number of tile rows
+    cols : int
+        number of tile columns
+    chunks : dict
+        (col, row) of every loaded chunk mapped to the list of its live sprites
+    cells : dict
+        live sprite mapped to (layer index, row, col) of its cell
+    center : (col, row)
+        chunk of the player at the last update, None before the first update
+    """
+
+    def __init__(self, layouts, create_tile, styles):
+        self.layouts = layouts.copy()
+        self.create_tile = create_tile
+        self.styles = styles
+        self.chunk_tiles = CHUNK_SIZE // TILE_SIZE
+        self.rows, self.cols = layouts.shape[1:]
+        self.chunks = {}
+        self.cells = {}
+        self.center = None
+
+    def chunk_of(self, pos):
+        """
+        Returns the chunk of a position in the level.
+
+        Parameters
+        ----------
+        pos : (x,y)
+            position in pixel
+
+        Returns
+        ----------
+        (int, int) : (col, row) of the chunk
+        """
+        return int(pos[0]) // CHUNK_SIZE, int(pos[1]) // CHUNK_SIZE
+
+    def chunk_range(self, center, radius):
+        """
+        Returns all chunks of the map within radius chunks of center.
+
+        Parameters
+        ----------
+        center : (col, row)
+            chunk in the middle
+        radius : int
+            distance in chunks
+
+        Returns
+        ----------
+        list : (col, row) of every chunk, row by row
+        """
+        last_col = (self.cols - 1) // self.chunk_tiles
+        last_row = (self.rows - 1) // self.chunk_tiles
+        return [(col, row) for row in range(max(center[1] - radius, 0), min(center[1] + radius, last_row) + 1)
+                for col in range(max(center[0] - radius, 0), min(center[0] + radius, last_col) + 1)]
+
+    def active_rect(self):
+        """
+        Returns the area in which souleaters are updated: the chunks within STREAM_RADIUS - 1 chunks of the player.
+
+        Returns
+        ----------
+        pygame.Rect : active area in pixel
+        """
+        radius = STREAM_RADIUS - 1
+        left, top = (self.center[0] - radius) * CHUNK_SIZE, (self.center[1] - radius) * CHUNK_SIZE
+        return pygame.Rect(left, top, (2 * radius + 1) * CHUNK_SIZE, (2 * radius + 1) * CHUNK_SIZE)
+
+    def update(self, pos):
+        """
+        Loads the chunks around the player and unloads the chunks the player has left, called once per simulation
+        tick. Does nothing as long as the player stays in the same chunk.
+
+        Parameters
+        ----------
+        pos : (x,y)
+            position of the player
+        """
+        center = self.chunk_of(pos)
+        if center == self.center:
+            return
+        self.center = center
+
+        for chunk in [chunk for chunk in self.chunks
+                      if max(abs(chunk[0] - center[0]), abs(chunk[1] - center[1])) > STREAM_RADIUS + 1]:
+            self.unload(chunk)
+        self.load([chunk for chunk in self.chunk_range(center, STREAM_RADIUS) if chunk not in self.chunks])
+
+    def load(self, chunks):
+        """
+        Creates the sprites of all non-empty cells of the streamed layers in new chunks. Cells are visited layer by
+        layer and row by row over the bounding box of the chunks, so the sprites of one call join their groups in map
+        order. Sprites of chunks loaded by a later call are appended after all sprites created before, the group order
+        is therefore the order of loading, not the order of the whole map.
+
+        Parameters
+        ----------
+        chunks : list
+            (col, row) of the chunks to load
+        """
+        if not chunks:
+            return
+        size = self.chunk_tiles
+        left = min(col for col, _ in chunks) * size
+        top = min(row for _, row in chunks) * size
+        right = min((max(col for col, _ in chunks) + 1) * size, self.cols)
+        bottom = min((max(row for _, row in chunks) + 1) * size, self.rows)
+
+        # cells of the bounding box which belong to one of the new chunks
+        mask = np.zeros((bottom - top, right - left), dtype=bool)
+        for col, row in chunks:
+            mask[row * size - top:(row + 1) * size - top, col * size - left:(col + 1) * size - left] = True
+            self.chunks[(col, row)] = []
+
+        for layer_index, (style, layout) in enumerate(zip(LAYERS, self.layouts)):
+            if style not in self.styles:
+                continue
+            window = layout[top:bottom, left:right]
+            for row, col in (np.argwhere((window != -1) & mask) + (top, left)).tolist():
+                sprite = self.create_tile(style, int(layout[row, col]), (col * TILE_SIZE, row * TILE_SIZE))
+                if sprite:
+                    self.chunks[(col // size, row // size)].append(sprite)
+                    self.cells[sprite] = (layer_index, row, col)
+
+    def unload(self, chunk):
+        """
+        Kills all sprites of a chunk, its cells stay in the layouts.
+
+        Parameters
+        ----------
+        chunk : (col, row)
+            chunk to unload
+        """
+        for sprite in self.chunks.pop(chunk):
+            del self.cells[sprite]
+            sprite.kill()
+
+    def remove(self, sprite):
+        """
+        Removes a collected item for good: its cell is cleared in the layouts, so it is not created again when its
+        chunk is loaded the next time.
+
+        Parameters
+        ----------
+        sprite : pygame.sprite.Sprite
+            collected item, created by create_tile
+        """
+        layer_index, row, col = self.cells.pop(sprite)
+        self.layouts[layer_index, row, col] = -1
+        self.chunks[(col // self.chunk_tiles, row // self.chunk_tiles)].remove(sprite)
+
+    def stats(self):
+        """
+        Returns streaming statistics for debugging and benchmarks.
+
+        Returns
+        ----------
+        dict : number of loaded chunks and live sprites
+        """
+        return {'chunks': len(self.chunks), 'sprites': len(self.cells)}
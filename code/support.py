@@ -6,7 +6,7 @@ import pygame
 from settings import TILE_SIZE
 
 
-def import_folder(path):
+def import_folder(path, load=pygame.image.load):
     """
     A support-method for reading the content of an image-directory with a given path and returning all the images as
     surface-list.
@@ -15,6 +15,8 @@ def import_folder(path):
     ----------
     path : str
         path of the directory
+    load : def
+        function decoding an image file
 
     Returns
     ----------
@@ -25,7 +27,7 @@ def import_folder(path):
     for _, __, image_files in walk(path):
         for image in image_files:
             full_path = path + '/' + image
-            image_surf = pygame.image.load(full_path).convert_alpha()
+            image_surf = load(full_path).convert_alpha()
             surface_list.append(image_surf)
 
     return surface_list
@@ -52,7 +54,7 @@ def import_csv_layout(path):
     return csv_map
 
 
-def import_cut_graphics(path):
+def import_cut_graphics(path, load=pygame.image.load):
     """
     A support-method providing compatibility with the tiled-editor. Image has to be cut in tiles according to the usage
     of the tiles in the editor. Surfaces with image-parts are returned in list.
@@ -61,12 +63,14 @@ def import_cut_graphics(path):
     ----------
     path : str
         path of the csv-file
+    load : def
+        function decoding an image file
 
     Returns
     ----------
     list : surface list of image-parts
     """
-    surface = pygame.image.load(path).convert_alpha()
+    surface = load(path).convert_alpha()
     tile_num_x = int(surface.get_size()[0] / TILE_SIZE)
     tile_num_y = int(surface.get_size()[1] / TILE_SIZE)
 
@@ -0,0 +1,183 @@
+import numpy as np
+import pygame
+
+from simulation import sim_clock
+
+
+class SouleaterSwarm:
+    """
+    A class to keep the state of all souleaters of a level in arrays. Positions, attack radii, idle states and the
+    attack and remember cooldowns live in NumPy arrays, the Souleater-objects read and write them through properties.
+    Once per tick the distance and direction to the player, the attack-radius and visible-radius checks and the
+    cooldowns are computed for all souleaters at once. Python code per souleater only runs for the state transitions
+    of souleaters which are not idle or are able to notice the player; idle souleaters out of sight are skipped.
+
+    Attributes
+    ----------
+    members : list
+        Souleater-objects, indexed like the arrays
+    positions : numpy.ndarray
+        (n, 2) center of each souleater
+    attack_radius : numpy.ndarray
+        radius in which each souleater is able to attack
+    idle : numpy.ndarray
+        True if the status of the souleater is an idle status
+    can_attack : numpy.ndarray
+        True if the souleater is able to attack
+    attack_time : numpy.ndarray
+        simulation tick of the last attack
+    attack_cooldown : numpy.ndarray
+        simulation ticks for cooldown after attack
+    can_remember : numpy.ndarray
+        True if the souleater is able to remember a new player position
+    remember_time : numpy.ndarray
+        simulation tick the player position was remembered
+    remember_cooldown : numpy.ndarray
+        cooldown in simulation ticks for remembering the player position
+    suspended : numpy.ndarray
+        True if the souleater is outside of the streamed area around the player and is not updated
+    navigation : Navigation
+        flow fields over the obstacle grid shared by all souleaters, set up by Level.create_map()
+    """
+
+    def __init__(self):
+        self.members = []
+        self.positions = np.zeros((0, 2))
+        self.attack_radius = np.zeros(0)
+        self.idle = np.zeros(0, dtype=bool)
+        self.can_attack = np.zeros(0, dtype=bool)
+        self.attack_time = np.zeros(0, dtype=np.int64)
+        self.attack_cooldown = np.zeros(0, dtype=np.int64)
+        self.can_remember = np.zeros(0, dtype=bool)
+        self.remember_time = np.zeros(0, dtype=np.int64)
+        self.remember_cooldown = np.zeros(0, dtype=np.int64)
+        self.suspended = np.zeros(0, dtype=bool)
+        self.navigation = None
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, souleater, attack_radius, attack_cooldown, remember_cooldown):
+        """
+        Adds a souleater to the swarm and appends its slot to every array.
+
+        Parameters
+        ----------
+        souleater : Souleater
+            new member, its rect has to be set up
+        attack_radius : int
+            radius in which attack on player is possible
+        attack_cooldown : int
+            simulation ticks for cooldown after attack
+        remember_cooldown : int
+            cooldown in simulation ticks for remembering player position
+
+        Returns
+        ----------
+        int : index of the souleater in the arrays
+        """
+        self.members.append(souleater)
+        self.positions = np.append(self.positions, [souleater.rect.center], axis=0)
+        self.attack_radius = np.append(self.attack_radius, attack_radius)
+        self.idle = np.append(self.idle, 'idle' in souleater.status)
+        self.can_attack = np.append(self.can_attack, True)
+        self.attack_time = np.append(self.attack_time, 0)
+        self.attack_cooldown = np.append(self.attack_cooldown, attack_cooldown)
+        self.can_remember = np.append(self.can_remember, True)
+        self.remember_time = np.append(self.remember_time, 0)
+        self.remember_cooldown = np.append(self.remember_cooldown, remember_cooldown)
+        self.suspended = np.append(self.suspended, False)
+        return len(self.members) - 1
+
+    def cooldown(self):
+        """
+        Cooldown timers of all souleaters: can_attack and can_remember are set back to True once their cooldown has
+        passed, see Souleater.cooldown().
+        """
+        current_time = sim_clock.ticks
+        self.can_attack |= current_time - self.attack_time >= self.attack_cooldown
+        self.can_remember |= current_time - self.remember_time >= self.remember_cooldown
+
+    def suspend_outside(self, rect):
+        """
+        Suspends all souleaters outside of rect and resumes the souleaters inside, see ChunkStreamer.active_rect().
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+            area in which souleaters are updated
+        """
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        self.suspended = (x < rect.left) | (x >= rect.right) | (y < rect.top) | (y >= rect.bottom)
+
+    def perceive(self, player_pos, visible_radius):
+        """
+        Computes distance and direction to the player and the radius checks for all souleaters.
+
+        Parameters
+        ----------
+        player_pos : (x,y)
+            current center of the player
+        visible_radius : float
+            radius in which the player can be seen
+
+        Returns
+        ----------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray) : distances, (n, 2) normalized directions and indices of the
+        souleaters which need a state update and are not suspended
+        """
+        delta = np.asarray(player_pos, dtype=float) - self.positions
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        direction = np.divide(delta, distance[:, None], out=np.zeros_like(delta), where=distance[:, None] > 0)
+
+        in_attack = (distance <= self.attack_radius) & self.can_attack
+        in_sight = distance <= visible_radius
+        active = np.flatnonzero((~self.idle | in_attack | in_sight) & ~self.suspended)
+        return distance, direction, active
+
+    def steer(self, index, target_pos):
+        """
+        Returns the direction in which a souleater has to move to reach target_pos through the maze, read from the
+        shared flow field to the tile of target_pos. Without navigation the direction points straight to target_pos.
+
+        Parameters
+        ----------
+        index : int
+            index of the souleater
+        target_pos : (x,y)
+            position to reach
+
+        Returns
+        ----------
+        pygame.math.Vector2 : normalized direction, zero if target_pos is reached
+        """
+        position = self.positions[index].tolist()
+        if self.navigation:
+            waypoint = self.navigation.waypoint(position, target_pos)
+        else:
+            waypoint = target_pos
+        direction = pygame.math.Vector2(waypoint) - pygame.math.Vector2(position)
+        if direction.magnitude() > 0:
+            direction = direction.normalize()
+        return direction
+
+    def update(self, player):
+        """
+        Update method to run cooldowns, perception and the state transitions of the active souleaters. Is called in
+        class Level update() method after all sprites have been updated.
+
+        Parameters
+        ----------
+        player : Player
+            player object
+        """
+        if not self.members:
+            return
+        self.cooldown()
+        distance, direction, active = self.perceive(player.rect.center, player.visible_radius)
+
+        for index, player_distance, player_direction in zip(active.tolist(), distance[active].tolist(),
+                                                            direction[active].tolist()):
+            souleater = self.members[index]
+            souleater.enemy_update(player, player_distance, player_direction)
+            self.idle[index] = 'idle' in souleater.status
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+
+import pygame
+
+from assets import assets
+from settings import TEXT_CACHE_SIZE, UI_FONT
+
+# characters rasterized into every atlas: printable ASCII
+ATLAS_CHARACTERS = ''.join(chr(code) for code in range(32, 127))
+
+
+class GlyphAtlas:
+    """
+    A class to rasterize the characters of a font in one size and color once into a single surface. Strings are
+    composed by blitting the sub-rects of their glyphs next to each other.
+
+    Parameters
+    ----------
+    font : pygame.font.Font
+        font to rasterize
+    color : pygame.Color
+        text color
+
+    Attributes
+    ----------
+    font : pygame.font.Font
+        see Parameters
+    color : pygame.Color
+        see Parameters
+    surface : pygame.Surface
+        atlas with all glyphs in one row
+    glyphs : dict
+        character mapped to the pygame.Rect of its glyph in surface
+    """
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+
+        # characters missing in the font have no width and are left out
+        rendered = [(character, font.render(character, False, color)) for character in ATLAS_CHARACTERS
+                    if font.size(character)[0] > 0]
+        width = sum(glyph.get_width() for _, glyph in rendered)
+        height = max(glyph.get_height() for _, glyph in rendered)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        x = 0
+        for character, glyph in rendered:
+            self.glyphs[character] = self.surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+    def compose(self, text):
+        """
+        Returns text as surface, composed from the glyphs of the atlas. Text with characters outside of the atlas is
+        rendered by the font directly.
+
+        Parameters
+        ----------
+        text : str
+            text to compose
+
+        Returns
+        ----------
+        pygame.Surface : text surface with transparent background
+        """
+        if not text:
+            return pygame.Surface((0, self.surface.get_height()), pygame.SRCALPHA)
+        if not all(character in self.glyphs for character in text):
+            return self.font.render(text, False, self.color)
+
+        rects = [self.glyphs[character] for character in text]
+        surface = pygame.Surface((sum(rect.width for rect in rects), max(rect.height for rect in rects)),
+                                 pygame.SRCALPHA)
+        x = 0
+        for rect in rects:
+            surface.blit(self.surface, (x, 0), rect)
+            x += rect.width
+        return surface
+
+
+class TextRenderer:
+    """
+    A class to render the texts of HUD, menus and overlays. One GlyphAtlas is built per font, size and color, so fonts
+    only rasterize each character once. Composed strings are kept in a least-recently-used cache of TEXT_CACHE_SIZE
+    entries, so repeated labels (e.g. an unchanged coin score) cost a single blit.
+
+    Attributes
+    ----------
+    atlases : dict
+        (font path, size, color) mapped to GlyphAtlas
+    strings : OrderedDict
+        (font path, size, color, text) mapped to the composed surface, ordered from least to most recently used
+    """
+
+    def __init__(self):
+        self.atlases = {}
+        self.strings = OrderedDict()
+
+    def render(self, text, size, color, font_path=UI_FONT):
+        """
+        Returns text as surface.
+
+        Parameters
+        ----------
+        text : str
+            text to render
+        size : int
+            font size
+        color : str or (r,g,b)
+            text color
+        font_path : str
+            path of the font file
+
+        Returns
+        ----------
+        pygame.Surface : shared text surface with transparent background, must not be modified
+        """
+        color = tuple(pygame.Color(color))
+        key = (font_path, size, color, text)
+        if key in self.strings:
+            self.strings.move_to_end(key)
+            return self.strings[key]
+
+        atlas_key = (font_path, size, color)
+        if atlas_key not in self.atlases:
+            self.atlases[atlas_key] = GlyphAtlas(assets.font(font_path, size), pygame.Color(color))
+        surface = self.atlases[atlas_key].compose(text)
+
+        self.strings[key] = surface
+        if len(self.strings) > TEXT_CACHE_SIZE:
+            self.strings.popitem(last=False)
+        return surface
+
+
+# process-wide text renderer
+text_renderer = TextRenderer()
@@ -1,7 +1,7 @@
 import pygame
 
+from animation import animation_clock
 from settings import *
-from support import import_folder
 
 
 class Tile(pygame.sprite.Sprite):
@@ -39,56 +39,48 @@ class Tile(pygame.sprite.Sprite):
         offset_y = pos[1] + (TILE_SIZE / 2)
         self.sprite_type = sprite_type
         self.image = surface
-        self.rect = self.image.get_rect(center=(offset_x, offset_y))
+        self.rect = surface.get_rect(center=(offset_x, offset_y))
         self.hitbox = self.rect.inflate(0, -10)
 
 
 class AnimatedTile(Tile):
     """
-    A class to create a sprite with an animation. Defines position of the tile on the screen.
+    A class to create a sprite with an animation. Defines position of the tile on the screen. All tiles of a type show
+    the same frame: the animation is run by the shared animation clock, the tile only looks its frame up when drawn.
 
     Parameters
     ----------
-    pos, groups, sprite_type, surface
+    pos, groups, sprite_type, surface, path
     pos : (x,y)
         determines position of the player-sprite
     groups : list
         determines the sprite groups the player belongs to
     sprite_type : str
-        type of sprite for identification
+        type of sprite for identification, also the name of its animation type
     surface: pygame.Surface
         sized surface for tile
+    path : str
+        folder of the animation images
 
     Attributes
     ----------
-    animations : list
-        images from folder to be displayed
-    frame_index : int
-        index of the image to be displayed
-    image : pygame.Surface
-        self.rect = self.image.get_rect(center=(offset_x, offset_y))
-        self.hitbox = self.rect.inflate(0, -10)
     image : pygame.Surface
-        surface form animations list with index frame_index
+        current frame of the animation of sprite_type
     """
 
     def __init__(self, pos, groups, sprite_type, surface, path):
+        animation_clock.register(sprite_type, path)
         super().__init__(pos, groups, sprite_type, surface)
-        self.animations = import_folder(path)
-        self.frame_index = 0
-        self.image = self.animations[self.frame_index]
 
-    def animate(self):
+    @property
+    def image(self):
         """
-        Method to display tile animation, loops over the content of animations list.
+        Current frame of the animation, read from the animation clock.
         """
-        self.frame_index += 0.05
-        if int(self.frame_index) == len(self.animations):
-            self.frame_index = 0
-        self.image = self.animations[int(self.frame_index)]
+        return animation_clock.frame(self.sprite_type)
 
-    def update(self):
+    @image.setter
+    def image(self, surface):
         """
-        Method to update animated tile. Calls animate().
+        Ignores the surface set by Tile, which only determines the size of the rect.
         """
-        self.animate()
@@ -1,37 +1,81 @@
 import pygame
 
+from assets import assets
 from settings import *
+from text import text_renderer
+from visibility import ShadowCaster
 
 
 class UI:
     """
     A class to display the user interface including coin-score, health-bar and a light raduis of the player.
 
+    Parameters
+    ----------
+    wall_grid : numpy.ndarray
+        (rows, cols) bool array, True for wall tiles, to cast shadows of the walls; None for light without shadows
+
     Attributes
     ----------
     display_surface : pygame.Display
         surface to display level
-    font : pygame.font.Font
-        type of font
+    coin_image : pygame.Surface
+        coin icon of the score
     health_bar_rect : pygame.Rect
         displays health-bar
     darkness_image : pygame.Image
         cover screen beyond the visible_radius of the player in black
     darkness_rect : pygame.Rect
          make darkness_image scale able
+    darkness_cache : dict
+        quantized visible_factor mapped to (screen-sized crop of the scaled darkness_image, position)
+    shadow_caster : ShadowCaster
+        computes the tiles hidden behind walls, None without wall_grid
     """
 
-    def __init__(self):
+    def __init__(self, wall_grid=None):
         # general
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
+        self.coin_image = assets.image('../graphics/coins/gold/0.png')
 
         # bar setup
         self.health_bar_rect = pygame.Rect(10, 10, HEALTH_BAR_WIDTH, BAR_HEIGHT)
 
         # display darkness
-        self.darkness_image = pygame.image.load('../graphics/terrain/visibility.png').convert_alpha()
+        self.darkness_image = assets.image('../graphics/terrain/visibility.png')
         self.darkness_rect = self.darkness_image.get_rect()[2:4]
+        self.darkness_cache = {}
+        self.shadow_caster = ShadowCaster(wall_grid) if wall_grid is not None else None
+
+    def darkness_mask(self, player_radius):
+        """
+        Returns the darkness_image scaled by player_radius and cropped to the screen. Masks are cached by the radius
+        quantized to DARKNESS_QUANTIZATION, so scaling only happens when the visible_factor of the player changes.
+
+        Parameters
+        ----------
+        player_radius : float
+            factor by which the darkness_image is scaled
+
+        Returns
+        ----------
+        (pygame.Surface, (x,y)) : cropped mask and its position on screen
+        """
+        key = round(player_radius / DARKNESS_QUANTIZATION)
+        if key not in self.darkness_cache:
+            radius = key * DARKNESS_QUANTIZATION
+            darkness_surf = pygame.transform.scale(self.darkness_image, (
+                int(self.darkness_rect[0] * radius), int(self.darkness_rect[1] * radius)))
+            darkness_rect = darkness_surf.get_rect(center=SCREEN_CENTER)
+
+            # keep only the part covering the screen
+            visible_rect = darkness_rect.clip(self.display_surface.get_rect())
+            crop = darkness_surf.subsurface(visible_rect.move(-darkness_rect.x, -darkness_rect.y)).copy()
+
+            if len(self.darkness_cache) >= DARKNESS_CACHE_SIZE:
+                del self.darkness_cache[next(iter(self.darkness_cache))]
+            self.darkness_cache[key] = (crop, visible_rect.topleft)
+        return self.darkness_cache[key]
 
     def show_radius(self, player_radius, light):
         """
@@ -43,15 +87,48 @@ class UI:
         player_radius : int
             radius in which player can be seen by enemies and the player can see
         """
-        # light is on: transform darkness by player.visible_factor
+        # light is on: cached darkness scaled by player.visible_factor
         if light:
-            darkness_surf = pygame.transform.scale(self.darkness_image, (
-                int(self.darkness_rect[0] * player_radius), int(self.darkness_rect[1]) * player_radius))
-            darkness_rect = darkness_surf.get_rect(center=SCREEN_CENTER)
-            self.display_surface.blit(darkness_surf, darkness_rect)
+            self.display_surface.blit(*self.darkness_mask(player_radius))
         # light is off:
         else:
-            pygame.draw.rect(self.display_surface, 'black', (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.display_surface.fill('black')
+
+    def show_shadows(self, player):
+        """
+        Method to cover the tiles within the light of the player which are hidden behind walls in black.
+
+        Parameters
+        ----------
+        player : Player
+            player object, at the center of the screen
+        """
+        light_radius = self.player_light_radius(player)
+        tile = (player.rect.centerx // TILE_SIZE, player.rect.centery // TILE_SIZE)
+        x = tile[0] * TILE_SIZE - player.rect.centerx + SCREEN_CENTER[0]
+        y = tile[1] * TILE_SIZE - player.rect.centery + SCREEN_CENTER[1]
+        screen_rect = self.display_surface.get_rect()
+        for dx, dy, length in self.shadow_caster.dark_runs(tile, light_radius):
+            # clipped first, fill() misplaces rects reaching over the left or top edge
+            run_rect = pygame.Rect(x + dx * TILE_SIZE, y + dy * TILE_SIZE, length * TILE_SIZE, TILE_SIZE)
+            self.display_surface.fill('black', run_rect.clip(screen_rect))
+
+    @staticmethod
+    def player_light_radius(player):
+        """
+        Returns the radius in tiles around the player tile which covers the light of the darkness mask.
+
+        Parameters
+        ----------
+        player : Player
+            player object
+
+        Returns
+        ----------
+        int : light radius in tiles
+        """
+        light = player.stats['visible_radius'] * player.visible_factor
+        return int(light // TILE_SIZE) + 2
 
     def show_bar(self, current_health, max_health, bg_rect, color):
         """
@@ -83,18 +160,18 @@ class UI:
 
     def show_coins(self, coins):
         """
-        Method to show collected coins by player.
+        Method to show collected coins by player. The score is composed by the shared text renderer, which caches it
+        until it changes.
 
         Parameters
         ----------
         coins : int
             collected coin value
         """
-        coin = pygame.image.load('../graphics/coins/gold/0.png').convert_alpha()
-        coin_rect = coin.get_rect(topleft=(260, 5))
-        self.display_surface.blit(coin, coin_rect)
+        coin_rect = self.coin_image.get_rect(topleft=(260, 5))
+        self.display_surface.blit(self.coin_image, coin_rect)
 
-        text_surf = self.font.render(str(int(coins)), False, TEXT_COLOR)
+        text_surf = text_renderer.render(str(int(coins)), UI_FONT_SIZE, TEXT_COLOR)
         text_rect = text_surf.get_rect(topleft=(320, 12))
         pygame.draw.rect(self.display_surface, UI_BACKGROUND_COLOR, text_rect.inflate(25, 10))
         pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, text_rect.inflate(25, 10), 3)
@@ -102,8 +179,11 @@ class UI:
 
     def display(self, player):
         """
-        A Method to display and update user interface in level class. Calls show_radius(), show_bar() and show_coins().
+        A Method to display and update user interface in level class. Calls show_radius(), show_shadows(),
+        show_bar() and show_coins().
         """
         self.show_radius(player.visible_factor, player.light_on)
+        if player.light_on and self.shadow_caster:
+            self.show_shadows(player)
         self.show_bar(player.health, player.stats['health'], self.health_bar_rect, HEALTH_BAR_COLOR)
         self.show_coins(player.coins)
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+from settings import VISIBILITY_CACHE_SIZE
+
+# transformations of the first octant into all eight octants: (xx, xy, yx, yy)
+OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+
+class ShadowCaster:
+    """
+    A class to find the tiles the light of the player reaches without passing through walls. Recursive shadow casting
+    scans the eight octants around the player tile row by row and narrows the lit slopes behind every wall. The result
+    is kept as the runs of dark tiles per row around the player tile, cached by (player tile, radius), so the
+    computation only runs when the player crosses a tile boundary or the radius changes.
+
+    Parameters
+    ----------
+    walls : numpy.ndarray
+        (rows, cols) bool array, True for wall tiles
+
+    Attributes
+    ----------
+    walls : numpy.ndarray
+        see Parameters
+    rows : int
+        number of tile rows
+    cols : int
+        number of tile columns
+    cache : OrderedDict
+        (player tile, radius) mapped to the dark runs, ordered from least to most recently used
+    """
+
+    def __init__(self, walls):
+        self.walls = walls
+        self.rows, self.cols = walls.shape
+        self.cache = OrderedDict()
+
+    def blocks_light(self, col, row):
+        """
+        Returns True if the tile is a wall or outside of the map.
+        """
+        return not (0 <= col < self.cols and 0 <= row < self.rows) or bool(self.walls[row, col])
+
+    def cast_light(self, origin, radius, row, start, end, octant, visible):
+        """
+        Scans one octant from row outwards and adds the lit tiles to visible. Calls itself for the part of the octant
+        which stays lit above a wall.
+
+        Parameters
+        ----------
+        origin : (col, row)
+            player tile
+        radius : int
+            light radius in tiles
+        row : int
+            first row of the octant to scan
+        start : float
+            upper slope of the lit part of the octant
+        end : float
+            lower slope of the lit part of the octant
+        octant : (int, int, int, int)
+            transformation of the first octant, see OCTANTS
+        visible : set
+            lit tiles as (col, row) relative to origin
+        """
+        if start < end:
+            return
+        xx, xy, yx, yy = octant
+        new_start = start
+        for distance in range(row, radius + 1):
+            blocked = False
+            for dx in range(-distance, 1):
+                dy = -distance
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+
+                # relative position of the tile in the transformed octant
+                x = dx * xx + dy * xy
+                y = dx * yx + dy * yy
+                if dx * dx + dy * dy <= radius * radius:
+                    visible.add((x, y))
+
+                wall = self.blocks_light(origin[0] + x, origin[1] + y)
+                if blocked:
+                    if wall:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif wall and distance < radius:
+                    blocked = True
+                    self.cast_light(origin, radius, distance + 1, start, left_slope, octant, visible)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def dark_runs(self, tile, radius):
+        """
+        Returns the tiles within radius around tile which are not reached by light, merged to horizontal runs.
+
+        Parameters
+        ----------
+        tile : (col, row)
+            player tile
+        radius : int
+            light radius in tiles
+
+        Returns
+        ----------
+        list : (dx, dy, length) of every run relative to tile, in tiles
+        """
+        key = (tile, radius)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        visible = {(0, 0)}
+        for octant in OCTANTS:
+            self.cast_light(tile, radius, 1, 1.0, 0.0, octant, visible)
+
+        runs = []
+        for dy in range(-radius, radius + 1):
+            run_start = None
+            for dx in range(-radius, radius + 2):
+                dark = dx <= radius and dx * dx + dy * dy <= radius * radius and (dx, dy) not in visible
+                if dark and run_start is None:
+                    run_start = dx
+                elif not dark and run_start is not None:
+                    runs.append((run_start, dy, dx - run_start))
+                    run_start = None
+
+        if len(self.cache) >= VISIBILITY_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        self.cache[key] = runs
+        return runs